@@ -0,0 +1,132 @@
+"""
+Throughput of parsing and rendering across document shapes.
+
+Reports MB/s, events/s, peak RSS, and per event the memory blocks a result
+keeps allocated and the peak bytes traced while rendering, for each target
+and shape, counting events with the flags of each target. Every shape runs in
+a fresh process, so its peak RSS is its own. Falls back to :mod:`.standin`
+when no native library loads.
+
+    python -m benchmarks [--standin] [--size 2000] [--save base.json]
+    python -m benchmarks --compare base.json
+"""
+
+import sys
+import json
+import argparse
+import multiprocessing
+
+from concurrent import futures
+
+from md4c import clients
+
+from . import corpora
+from . import measures
+
+
+_context = multiprocessing.get_context('spawn')
+
+
+def run(targets, shapes, size, repeat, fake = False):
+
+    """
+    Get ``{target: {shape: metrics}}``; unavailable targets are left out.
+
+    Every shape is measured in a fresh process, using :mod:`.standin` if
+    ``fake``.
+    """
+
+    results = {}
+
+    for target in targets:
+        metrics = {}
+        for shape in shapes:
+            args = (target, shape, size, repeat, fake)
+            with futures.ProcessPoolExecutor(1, mp_context = _context) as pool:
+                future = pool.submit(measures.measure, *args)
+                try:
+                    metrics[shape] = future.result()
+                except ImportError as error:
+                    print(f'skipping {target}: {error}', file = sys.stderr)
+                    break
+        else:
+            results[target] = metrics
+
+    return results
+
+
+def _show(results, baseline):
+
+    header = f'{"target":<8} {"shape":<8} {"MB/s":>9} {"events/s":>12} {"rss MiB":>8} {"blk/event":>9} {"B/event":>9}'
+
+    if baseline:
+        header += f' {"vs base":>8}'
+
+    print(header)
+
+    for (target, metrics) in results.items():
+        for (shape, values) in metrics.items():
+            rss = values['rss']
+            rss = '-' if rss is None else f'{rss / 2 ** 20:.1f}'
+            line = (
+                f'{target:<8} {shape:<8} {values["mb/s"]:>9.2f} '
+                f'{values["events/s"]:>12.0f} {rss:>8} '
+                f'{values["blocks/event"]:>9.2f} {values["b/event"]:>9.1f}'
+            )
+            if baseline:
+                try:
+                    previous = baseline[target][shape]['mb/s']
+                except KeyError:
+                    change = '-'
+                else:
+                    change = f'{(values["mb/s"] / previous - 1) * 100:+.1f}%'
+                line += f' {change:>8}'
+            print(line)
+
+
+def main(args = None):
+
+    parser = argparse.ArgumentParser(prog = 'python -m benchmarks')
+
+    parser.add_argument('--standin', action = 'store_true', help = 'use the stand-in event source')
+
+    parser.add_argument('--size', type = int, default = 2000, help = 'units per document')
+
+    parser.add_argument('--repeat', type = int, default = 5, help = 'runs per measurement')
+
+    parser.add_argument('--targets', nargs = '+', choices = tuple(measures.targets), default = tuple(measures.targets))
+
+    parser.add_argument('--shapes', nargs = '+', choices = tuple(corpora.shapes), default = tuple(corpora.shapes))
+
+    parser.add_argument('--save', metavar = 'PATH', help = 'write results as a json baseline')
+
+    parser.add_argument('--compare', metavar = 'PATH', help = 'compare against a json baseline')
+
+    args = parser.parse_args(args)
+
+    fake = args.standin
+
+    if not fake:
+        try:
+            clients.load()
+        except OSError as error:
+            print(f'using stand-in: {error}', file = sys.stderr)
+            fake = True
+
+    results = run(args.targets, args.shapes, args.size, args.repeat, fake)
+
+    baseline = None
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    _show(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent = 2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Synthetic documents of various shapes.
+"""
+
+
+__all__ = ('nested', 'tables', 'links', 'code', 'unicode', 'shapes')
+
+
+_words = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod '
+    'tempor incididunt ut labore et dolore magna aliqua'
+).split()
+
+
+def _sentence(index, count = 12):
+
+    return ' '.join(_words[(index + step) % len(_words)] for step in range(count))
+
+
+def nested(size):
+
+    """
+    Deeply nested lists.
+    """
+
+    lines = []
+
+    for index in range(size):
+        depth = index % 8
+        lines.append(f'{"  " * depth}- {_sentence(index, 6)} *{depth}*')
+
+    return '\n'.join(lines) + '\n'
+
+
+def tables(size):
+
+    """
+    One huge table.
+    """
+
+    lines = ['| id | name | value | note |', '|:---|:----:|------:|------|']
+
+    for index in range(size):
+        lines.append(f'| {index} | {_words[index % len(_words)]} | '
+                     f'{index * 7} | {_sentence(index, 4)} |')
+
+    return '\n'.join(lines) + '\n'
+
+
+def links(size):
+
+    """
+    Paragraphs dense with links.
+    """
+
+    parts = []
+
+    for index in range(size):
+        word = _words[index % len(_words)]
+        parts.append(f'[{word}](https://example.com/{word}?q={index}&amp;x=1)')
+        if index % 10 == 9:
+            parts.append('\n\n')
+
+    return ' '.join(parts) + '\n'
+
+
+def code(size):
+
+    """
+    Long fenced code blocks.
+    """
+
+    blocks = []
+
+    for index in range(max(size // 100, 1)):
+        body = '\n'.join(
+            f'    value_{line} = compute({line}) < {line * 2}' for line in range(100)
+        )
+        blocks.append(f'```python\n{body}\n```\n')
+
+    return '\n'.join(blocks)
+
+
+def unicode(size):
+
+    """
+    Prose in non-ascii scripts.
+    """
+
+    words = 'Ελληνικά кириллица 日本語のテキスト العربية हिन्दी ñandú ümlaut'.split()
+
+    paragraphs = []
+
+    for index in range(max(size // 10, 1)):
+        lines = (
+            ' '.join(words[(index + step) % len(words)] for step in range(10))
+            for line in range(10)
+        )
+        paragraphs.append('\n'.join(lines))
+
+    return '\n\n'.join(paragraphs) + '\n'
+
+
+shapes = {
+    'nested' : nested,
+    'tables' : tables,
+    'links'  : links,
+    'code'   : code,
+    'unicode': unicode
+}
@@ -0,0 +1,126 @@
+"""
+Per-event cost of dispatching enter callbacks to ``_parse_*`` handlers, and
+leave callbacks to ``_leave_*`` handlers.
+
+Compares the previous path, which built the enum twice and resolved the
+handler by name on every event, against the class-level dispatch tables;
+and branching on the type within ``_leave`` against the leave tables.
+Runs without the native library.
+
+    python -m benchmarks.dispatch
+"""
+
+import timeit
+
+from md4c import enums
+from md4c import wraps
+from md4c import parsers
+
+
+class Parser(parsers.Base):
+
+    __slots__ = ()
+
+    def _parse_p(self, state, info):
+
+        pass
+
+    def _parse_em(self, state, info):
+
+        pass
+
+    def _track(self, state, type, data):
+
+        pass
+
+    def _leave(self, state, type, info):
+
+        pass
+
+    def _leave_ul(self, state, type, info):
+
+        pass
+
+    _leave_ol = _leave_ul
+
+    def _get(self, state):
+
+        pass
+
+    def _branch(self, state, type, info):
+
+        if type is enums.Block.ul or type is enums.Block.ol:
+            self._leave_ul(state, type, info)
+            return
+
+        self._leave(state, type, info)
+
+
+def _enum_cb(cls, spot = 0):
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            args = list(args)
+            args[spot] = cls(args[spot])
+            return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def _before(parser):
+
+    def enter(state, type, info):
+        name = parser._res(type)
+        name = f'_parse_{name}'
+        func = getattr(parser, name, None)
+        if not func:
+            return
+        func(state, info)
+
+    @_enum_cb(enums.Block)
+    def wrapper(type, detail_a, udata):
+        type = enums.Block(type)
+        detail = None
+        enter(wraps.contexts.get(udata), type, detail)
+        return 0
+
+    return wrapper
+
+
+def _after(parser):
+
+    return wraps.block(parser._enter, userdata = True)
+
+
+def _leaver(func):
+
+    return wraps.block(func, userdata = True)
+
+
+def main(number = 200000):
+
+    parser = Parser.__new__(Parser)
+
+    events = (enums.Block.p.value, enums.Block.hr.value)
+
+    leaves = (enums.Block.p.value, enums.Block.ul.value, enums.Block.li.value)
+
+    paths = (
+        ('before', _before(parser), events),
+        ('after' , _after(parser) , events),
+        ('leave before', _leaver(parser._branch), leaves),
+        ('leave after' , _leaver(parser._exit)  , leaves)
+    )
+
+    for (name, callback, types) in paths:
+        timer = timeit.Timer(
+            lambda: [callback(type, None, None) for type in types]
+        )
+        seconds = min(timer.repeat(5, number // len(types)))
+        print(f'{name:>12}: {seconds / number * 1e9:7.1f} ns/event')
+
+
+if __name__ == '__main__':
+
+    main()
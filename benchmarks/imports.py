@@ -0,0 +1,82 @@
+"""
+Cold import time of the package, against a budget.
+
+Runs ``python -X importtime -c "import md4c"`` in fresh interpreters, keeps
+the best cumulative time, and fails if it is over ``--budget`` or if any
+lazily loaded module was imported.
+
+    python -m benchmarks.imports [--budget 30] [--repeat 5]
+"""
+
+import sys
+import argparse
+import subprocess
+
+
+__all__ = ('budget', 'measure')
+
+
+# milliseconds import md4c may take by default
+budget = 30
+
+
+# modules that must only load on first use
+_lazy = ('md4c.clients', 'md4c.parsers', 'ctypes', 'bs4', 'sty')
+
+
+_script = f'''
+import sys
+import md4c
+print(*(name for name in {_lazy!r} if name in sys.modules))
+'''
+
+
+def measure():
+
+    """
+    Get the milliseconds it took to import ``md4c`` and the lazy modules it
+    imported anyway.
+    """
+
+    process = subprocess.run(
+        (sys.executable, '-X', 'importtime', '-c', _script),
+        capture_output = True,
+        text = True,
+        check = True
+    )
+
+    for line in process.stderr.splitlines():
+        (self, cumulative, name) = line.split('|')
+        if name.strip() == 'md4c':
+            break
+    else:
+        raise RuntimeError('md4c missing from importtime output')
+
+    return (int(cumulative) / 1000, process.stdout.split())
+
+
+def main(args = None):
+
+    parser = argparse.ArgumentParser(prog = 'python -m benchmarks.imports')
+
+    parser.add_argument('--budget', type = float, default = budget, help = 'milliseconds allowed')
+
+    parser.add_argument('--repeat', type = int, default = 5, help = 'interpreters to run')
+
+    args = parser.parse_args(args)
+
+    results = [measure() for _ in range(args.repeat)]
+
+    (best, loaded) = min(results)
+
+    print(f'import md4c: {best:.1f}ms (budget {args.budget:.1f}ms)')
+
+    if loaded:
+        print(f'imported eagerly: {", ".join(loaded)}')
+
+    if best > args.budget or loaded:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Measurements of single targets and shapes, run by ``python -m benchmarks`` in
+fresh processes.
+"""
+
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from md4c import clients
+from md4c import parsers
+
+from . import corpora
+from . import standin
+
+
+__all__ = ('targets', 'measure')
+
+
+def _noop(*args):
+
+    return 0
+
+
+def _main():
+
+    # what html parsers use, so tables are parsed as such
+    client = clients.Main(
+        flags = parsers.Base.flags | parsers.Markup.flags,
+        enter_block = _noop,
+        leave_block = _noop,
+        enter_span = _noop,
+        leave_span = _noop,
+        text = _noop
+    )
+
+    return (client.parse, client.record)
+
+
+def _parser(cls):
+
+    def create():
+        parser = cls()
+        return (parser.get, parser.client.record)
+
+    return create
+
+
+targets = {
+    'parse' : _main,
+    'markup': _parser(parsers.Markup),
+    'html'  : _parser(parsers.Html),
+    'ansi'  : _parser(parsers.Ansi)
+}
+
+
+def _rss():
+
+    if not resource:
+        return None
+
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # bytes on darwin, kibibytes elsewhere
+    return value if sys.platform == 'darwin' else value * 1024
+
+
+def _measure(func, value, repeat):
+
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(value)
+        best = min(best, time.perf_counter() - start)
+
+    # blocks still allocated afterwards, which the result holds on to
+    blocks = sys.getallocatedblocks()
+
+    result = func(value)
+
+    blocks = sys.getallocatedblocks() - blocks
+
+    del result
+
+    tracemalloc.start()
+
+    try:
+        func(value)
+        (current, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (best, max(blocks, 0), peak)
+
+
+def measure(target, shape, size, repeat, fake = False):
+
+    """
+    Get the metrics of rendering ``shape`` with ``target``, using
+    :mod:`.standin` if ``fake``.
+    """
+
+    if fake:
+        standin.install()
+    else:
+        clients.load()
+
+    (func, record) = targets[target]()
+
+    value = corpora.shapes[shape](size)
+
+    data = value.encode()
+
+    count = len(record(data))
+
+    (seconds, blocks, peak) = _measure(func, value, repeat)
+
+    return {
+        'mb/s'         : len(data) / seconds / 1e6,
+        'events/s'     : count / seconds,
+        'rss'          : _rss(),
+        'blocks/event' : blocks / count,
+        'b/event'      : peak / count
+    }
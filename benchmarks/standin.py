@@ -0,0 +1,448 @@
+"""
+A stand-in for the native library, for machines without one.
+
+It understands just enough markdown for :mod:`.corpora` (headings,
+paragraphs, emphasis, links, entities, fenced code, nested lists and
+tables), and for the tests (link reference definitions and full reference
+links), and replays its events through the real callbacks, so the cost of
+the bindings is measured while md4c's own is left out.
+"""
+
+import re
+import ctypes
+
+from md4c import types
+from md4c import enums
+from md4c import binds
+from md4c import details
+from md4c import clients
+
+
+__all__ = ('Library', 'install')
+
+
+_Block = enums.Block
+
+_Span = enums.Span
+
+_Text = enums.Text
+
+
+_soft_br = ctypes.create_string_buffer(b'\n')
+
+
+_entity = re.compile(rb'&[a-z]+;')
+
+
+_inline = re.compile(
+    rb'\*([^*\n]+)\*|\[([^\]\n]+)\]\(([^)\s]+)\)|\[([^\]\n]+)\]\[([^\]\n]+)\]|'
+    rb'&[a-z]+;'
+)
+
+
+_definition = re.compile(
+    rb' {0,3}\[([^\[\]]+)\]:[ \t]*\n?[ \t]*(<[^<>\n]*>|\S+)'
+    rb'(?:(?:[ \t]+|[ \t]*\n[ \t]*)(?:"[^"]*"|\'[^\']*\'|\([^()]*\))[ \t]*(?:\n|$)|'
+    rb'[ \t]*(?:\n|$))'
+)
+
+
+_item = re.compile(rb'( *)- ')
+
+
+_fence = re.compile(rb'```(\w*)')
+
+
+def _attribute(attribute, value):
+
+    attribute.text = value
+
+    attribute.size = len(value)
+
+    (substr_types, substr_offsets) = ([], [])
+
+    position = 0
+
+    for match in _entity.finditer(value):
+        if match.start() > position:
+            substr_types.append(_Text.normal)
+            substr_offsets.append(position)
+        substr_types.append(_Text.entity)
+        substr_offsets.append(match.start())
+        position = match.end()
+
+    if position < len(value) or not substr_offsets:
+        substr_types.append(_Text.normal)
+        substr_offsets.append(position)
+
+    substr_offsets.append(len(value))
+
+    attribute.substr_types = (types.enum * len(substr_types))(*substr_types)
+
+    attribute.substr_offsets = (types.offset * len(substr_offsets))(*substr_offsets)
+
+
+def _text(events, type, start, end):
+
+    if end > start:
+        events.append(('text', type, None, (start, end - start)))
+
+
+def _label(value):
+
+    return b' '.join(value.split()).lower()
+
+
+def _link(events, href, span):
+
+    detail = details.A()
+
+    _attribute(detail.href, href)
+
+    events.append(('enter_span', _Span.a, detail, None))
+
+    _text(events, _Text.normal, *span)
+
+    events.append(('leave_span', _Span.a, detail, None))
+
+
+def _spans(events, links, data, start, end):
+
+    position = start
+
+    for match in _inline.finditer(data, start, end):
+        _text(events, _Text.normal, position, match.start())
+        if match.group(1):
+            events.append(('enter_span', _Span.em, None, None))
+            _text(events, _Text.normal, *match.span(1))
+            events.append(('leave_span', _Span.em, None, None))
+        elif match.group(2):
+            _link(events, match.group(3), match.span(2))
+        elif match.group(4):
+            href = links.get(_label(match.group(5)))
+            if href is None:
+                _text(events, _Text.normal, *match.span())
+            else:
+                _link(events, href, match.span(4))
+        else:
+            _text(events, _Text.entity, *match.span())
+        position = match.end()
+
+    _text(events, _Text.normal, position, end)
+
+
+class _Tokenizer:
+
+    __slots__ = ('_data', '_lines', '_events', '_links')
+
+    def __init__(self, data):
+
+        self._data = data
+
+        self._lines = []
+
+        start = 0
+
+        for line in data.split(b'\n'):
+            self._lines.append((start, start + len(line)))
+            start += len(line) + 1
+
+        self._events = []
+
+        self._links = {}
+
+        (index, start) = (0, True)
+
+        # definitions apply to the whole document, so are found first
+        while index < len(self._lines):
+            line = self._line(index)
+            match = start and _definition.match(data, self._lines[index][0])
+            if match:
+                href = match.group(2).strip(b'<>')
+                self._links.setdefault(_label(match.group(1)), href)
+                index = self._definition(index)
+                continue
+            start = not line.strip()
+            index += 1
+
+    def _line(self, index):
+
+        (start, end) = self._lines[index]
+
+        return self._data[start:end]
+
+    def _block(self, type, detail, index, *args):
+
+        self._events.append(('enter_block', type, detail, None))
+
+        index = index if args[0] is None else args[0](index, *args[1:])
+
+        self._events.append(('leave_block', type, detail, None))
+
+        return index
+
+    def _code(self, index):
+
+        lang = _fence.match(self._line(index)).group(1)
+
+        detail = details.Code()
+
+        _attribute(detail.lang, lang)
+
+        detail.fence_char = b'`'
+
+        self._events.append(('enter_block', _Block.code, detail, None))
+
+        index += 1
+
+        while index < len(self._lines) and not self._line(index).startswith(b'```'):
+            (start, end) = self._lines[index]
+            _text(self._events, _Text.code, start, end + 1)
+            index += 1
+
+        self._events.append(('leave_block', _Block.code, detail, None))
+
+        return index + 1
+
+    def _heading(self, index):
+
+        line = self._line(index)
+
+        level = len(line) - len(line.lstrip(b'#'))
+
+        detail = details.H()
+
+        detail.level = level
+
+        (start, end) = self._lines[index]
+
+        self._events.append(('enter_block', _Block.h, detail, None))
+
+        _spans(self._events, self._links, self._data, start + level + 1, end)
+
+        self._events.append(('leave_block', _Block.h, detail, None))
+
+        return index + 1
+
+    def _row(self, index, cell, align):
+
+        (start, end) = self._lines[index]
+
+        self._events.append(('enter_block', _Block.tr, None, None))
+
+        position = start + 1
+
+        for (column, value) in enumerate(self._line(index)[1:-1].split(b'|')):
+            detail = details.Td()
+            detail.align = align[column % len(align)]
+            self._events.append(('enter_block', cell, detail, None))
+            stripped = value.strip()
+            offset = position + value.find(stripped) if stripped else position
+            _spans(self._events, self._links, self._data, offset, offset + len(stripped))
+            self._events.append(('leave_block', cell, detail, None))
+            position += len(value) + 1
+
+        self._events.append(('leave_block', _Block.tr, None, None))
+
+    def _table(self, index):
+
+        align = []
+
+        for value in self._line(index + 1)[1:-1].split(b'|'):
+            value = value.strip()
+            if value.startswith(b':') and value.endswith(b':'):
+                align.append(enums.Align.center)
+            elif value.startswith(b':'):
+                align.append(enums.Align.left)
+            elif value.endswith(b':'):
+                align.append(enums.Align.right)
+            else:
+                align.append(enums.Align.default)
+
+        self._events.append(('enter_block', _Block.table, None, None))
+
+        self._events.append(('enter_block', _Block.thead, None, None))
+
+        self._row(index, _Block.th, align)
+
+        self._events.append(('leave_block', _Block.thead, None, None))
+
+        self._events.append(('enter_block', _Block.tbody, None, None))
+
+        index += 2
+
+        while index < len(self._lines) and self._line(index).startswith(b'|'):
+            self._row(index, _Block.td, align)
+            index += 1
+
+        self._events.append(('leave_block', _Block.tbody, None, None))
+
+        self._events.append(('leave_block', _Block.table, None, None))
+
+        return index
+
+    def _list(self, index, indent):
+
+        detail = details.Ul()
+
+        detail.is_tight = 1
+
+        detail.mark = b'-'
+
+        self._events.append(('enter_block', _Block.ul, detail, None))
+
+        while index < len(self._lines):
+            match = _item.match(self._line(index))
+            if not match or len(match.group(1)) != indent:
+                break
+            (start, end) = self._lines[index]
+            item = details.Li()
+            self._events.append(('enter_block', _Block.li, item, None))
+            _spans(self._events, self._links, self._data, start + match.end(), end)
+            index += 1
+            if index < len(self._lines):
+                match = _item.match(self._line(index))
+                if match and len(match.group(1)) > indent:
+                    index = self._list(index, len(match.group(1)))
+            self._events.append(('leave_block', _Block.li, item, None))
+
+        self._events.append(('leave_block', _Block.ul, detail, None))
+
+        return index
+
+    def _paragraph(self, index):
+
+        self._events.append(('enter_block', _Block.p, None, None))
+
+        first = index
+
+        while index < len(self._lines):
+            line = self._line(index)
+            if not line.strip() or self._kind(index, False) != self._paragraph:
+                break
+            if index > first:
+                self._events.append(('text', _Text.soft_br, None, _soft_br))
+            _spans(self._events, self._links, self._data, *self._lines[index])
+            index += 1
+
+        self._events.append(('leave_block', _Block.p, None, None))
+
+        return index
+
+    def _definition(self, index):
+
+        end = _definition.match(self._data, self._lines[index][0]).end()
+
+        while index < len(self._lines) and self._lines[index][0] < end:
+            index += 1
+
+        return index
+
+    def _kind(self, index, start = True):
+
+        line = self._line(index)
+
+        # definitions cannot interrupt paragraphs
+        if start and _definition.match(self._data, self._lines[index][0]):
+            return self._definition
+
+        if line.startswith(b'```'):
+            return self._code
+
+        if line.startswith(b'#'):
+            return self._heading
+
+        if _item.match(line):
+            return self._list
+
+        if line.startswith(b'|') and index + 1 < len(self._lines):
+            if self._line(index + 1).startswith(b'|:') or self._line(index + 1).startswith(b'|-'):
+                return self._table
+
+        return self._paragraph
+
+    def __call__(self):
+
+        self._events.append(('enter_block', _Block.doc, None, None))
+
+        index = 0
+
+        while index < len(self._lines):
+            if not self._line(index).strip():
+                index += 1
+                continue
+            kind = self._kind(index)
+            if kind == self._list:
+                index = kind(index, len(_item.match(self._line(index)).group(1)))
+            else:
+                index = kind(index)
+
+        self._events.append(('leave_block', _Block.doc, None, None))
+
+        return self._events
+
+
+class _Parse:
+
+    __slots__ = ('_events',)
+
+    argtypes = binds._functions[0][1]
+
+    def __init__(self):
+
+        self._events = {}
+
+    def __call__(self, text, size, parser, userdata):
+
+        (address, size) = (text.value, size.value)
+
+        data = ctypes.string_at(address, size)
+
+        try:
+            events = self._events[data]
+        except KeyError:
+            events = self._events[data] = _Tokenizer(data)()
+
+        parser = parser.contents
+
+        userdata = userdata.value
+
+        for (name, type, detail, text) in events:
+            callback = getattr(parser, name)
+            if name == 'text':
+                if isinstance(text, tuple):
+                    (start, size) = text
+                    result = callback(type, address + start, size, userdata)
+                else:
+                    result = callback(type, ctypes.addressof(text), 1, userdata)
+            else:
+                detail = ctypes.addressof(detail) if detail else None
+                result = callback(type, detail, userdata)
+            if result:
+                return result
+
+        return 0
+
+
+class Library:
+
+    """
+    Exposes a stand-in ``md_parse``.
+    """
+
+    __slots__ = ('md_parse',)
+
+    _name = None
+
+    def __init__(self):
+
+        self.md_parse = _Parse()
+
+
+def install():
+
+    """
+    Use the stand-in instead of the native library.
+    """
+
+    clients.lib = Library()
@@ -2,8 +2,41 @@
 from .enums import *
 from .flags import *
 
-from .clients import *
-from .parsers import *
 
+# clients and parsers pull in ctypes, the callbacks and the native library,
+# so they are only imported once one of their names is used
+_lazy = {
+    'load'  : 'clients',
+    'Main'  : 'clients',
+    'Base'  : 'parsers',
+    'Tree'  : 'parsers',
+    'Html'  : 'parsers',
+    'Markup': 'parsers',
+    'Ansi'  : 'parsers',
+    'Tables': 'parsers'
+}
 
-__all__ = (*enums.__all__, *flags.__all__, *clients.__all__, *parsers.__all__)
+
+def __getattr__(name):
+
+    import importlib
+
+    if name in _lazy:
+        module = importlib.import_module(f'.{_lazy[name]}', __name__)
+        return getattr(module, name)
+
+    try:
+        return importlib.import_module(f'.{name}', __name__)
+    except ModuleNotFoundError as error:
+        if error.name != f'{__name__}.{name}':
+            raise
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+
+    return sorted({*globals(), *_lazy})
+
+
+__all__ = (*enums.__all__, *flags.__all__, *_lazy)
@@ -30,7 +30,7 @@ _functions = (
     (
         'md_parse',
         (
-            types.char_p,
+            types.void,
             types.size,
             ctypes.POINTER(Storage),
             types.void
@@ -74,10 +74,10 @@ _assets = (
 )
 
 
-def create(**options):
+def assemble(**options):
 
     """
-    Get the struct holding all callbacks.
+    Get the struct holding all callbacks, without wrapping them.
     """
 
     args = []
@@ -86,11 +86,111 @@ def create(**options):
 
     (wraps, fails) = zip(*_assets)
 
-    for (name, fail, func, wrap) in zip(names, fails, funcs, wraps):
+    for (name, fail, func) in zip(names, fails, funcs):
         value = options.get(name) or fail
-        if wrap:
-            value = wrap(value)
         value = func(value)
         args.append(value)
 
     return Storage(*args)
+
+
+_clauses = ('enter_block', 'leave_block', 'enter_span', 'leave_span')
+
+
+def create(interest = None,
+           details = None,
+           profiler = None,
+           diagnostics = None,
+           limits = None,
+           coalescer = None,
+           userdata = False,
+           unpack = False,
+           **options):
+
+    """
+    Get the struct holding all callbacks.
+
+    ``interest`` maps callback names to the only types they should receive.
+    ``details`` holds the names of clause callbacks that should receive
+    details, instead of ``None``; all of them by default. A ``profiler``
+    from :mod:`~.profiles` times and counts events of clauses and text. A
+    ``diagnostics`` channel from :mod:`~.diagnostics` receives the
+    ``debug_log`` and ``syntax`` callbacks, and tracks text if it wants
+    offsets. :mod:`~.limits` are checked before every clause and text. A
+    ``coalescer`` from :mod:`~.runs` merges text before all of the above.
+    With ``userdata``, clauses, text and ``debug_log`` receive their context
+    first, and with ``unpack``, clauses and text receive its items instead.
+    """
+
+    interest = interest or {}
+
+    (names, funcs) = zip(*Storage._fields_)
+
+    for (name, (wrap, fail)) in zip(names, _assets):
+        if not wrap:
+            continue
+        value = options.get(name)
+        profile = profiler and (name in _clauses or name == 'text')
+        if value and profile:
+            value = profiler.handler(name, value)
+        value = value or fail
+        kwargs = {}
+        if name in interest:
+            kwargs['only'] = interest[name]
+        if details is not None and name in _clauses:
+            kwargs['detail'] = name in details
+        if userdata and name != 'syntax':
+            kwargs['userdata'] = True
+        if unpack and (name in _clauses or name == 'text'):
+            kwargs['unpack'] = True
+        value = wrap(value, **kwargs)
+        if profile:
+            value = profiler.trampoline(name, value)
+        if limits and (name in _clauses or name == 'text'):
+            value = limits.trampoline(name, value)
+        if coalescer and (name in _clauses or name == 'text'):
+            value = coalescer.trampoline(name, value)
+        options[name] = value
+
+    if diagnostics:
+        options['debug_log'] = diagnostics.debug_log
+        options['syntax'] = diagnostics.syntax
+        if diagnostics.offsets:
+            options['text'] = diagnostics.trampoline(options['text'])
+
+    return assemble(**options)
+
+
+def check(lib, version):
+
+    """
+    Make sure ``lib`` accepts :class:`Storage` at ``version``, by parsing
+    nothing with it.
+    """
+
+    messages = []
+
+    store = assemble(
+        api_version = version,
+        debug_log = lambda message, udata: messages.append(message)
+    )
+
+    (name, argtypes, restype, errcheck) = _functions[0]
+
+    # a fresh function, so results are not discarded by errcheck
+    func = lib[name]
+
+    func.argtypes = argtypes
+
+    func.restype = restype
+
+    text = ctypes.create_string_buffer(0)
+
+    result = func(ctypes.addressof(text), 0, store, None)
+
+    if result:
+        message = b' '.join(messages).decode('utf-8', 'replace')
+        raise OSError(
+            f'md4c rejects api_version {version} with {ctypes.sizeof(Storage)} '
+            f'byte callbacks ({result}): {message or "no message"}'
+        )
@@ -0,0 +1,330 @@
+import os
+import abc
+import time
+import hashlib
+import tempfile
+import threading
+import collections
+
+
+__all__ = ('Stats', 'Base', 'Memory', 'Disk')
+
+
+class Stats:
+
+    """
+    Counters of cache lookups.
+    """
+
+    __slots__ = ('hits', 'misses', 'evictions')
+
+    def __init__(self):
+
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def ratio(self):
+
+        """
+        The fraction of lookups that were hits.
+        """
+
+        total = self.hits + self.misses
+
+        return self.hits / total if total else 0.0
+
+    def as_dict(self):
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+
+        values = ', '.join(
+            f'{key}={value}' for (key, value) in self.as_dict().items()
+        )
+
+        return f'{self.__class__.__name__}({values})'
+
+
+class Base(abc.ABC):
+
+    """
+    Source for all caches.
+
+    Entries are bounded by ``size`` in count and by ``limit`` in total length
+    of their values, evicting the least recently used first.
+
+    For custom backends, overwrite :meth:`_get`, :meth:`_set` and
+    :meth:`clear`.
+    """
+
+    __slots__ = ('_size', '_limit', '_stats', '_lock')
+
+    def __init__(self, size = 1024, limit = 64 * 2 ** 20):
+
+        self._size = size
+
+        self._limit = limit
+
+        self._stats = Stats()
+
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+
+        return self._stats
+
+    @abc.abstractmethod
+    def _get(self, key):
+
+        """
+        Should return the value for ``key``, or ``None``.
+        """
+
+    @abc.abstractmethod
+    def _set(self, key, value):
+
+        """
+        Should store ``value`` for ``key`` and return the amount evicted.
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+
+        """
+        Remove all entries.
+        """
+
+    def get(self, key):
+
+        """
+        Get the value for ``key``, or ``None``.
+        """
+
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+
+        return value
+
+    def set(self, key, value):
+
+        """
+        Store ``value`` for ``key``.
+        """
+
+        if len(value) > self._limit:
+            return
+
+        with self._lock:
+            self._stats.evictions += self._set(key, value)
+
+
+class Memory(Base):
+
+    """
+    Keeps entries in process memory.
+    """
+
+    __slots__ = ('_entries', '_total')
+
+    def __init__(self, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+
+        self._entries = collections.OrderedDict()
+
+        self._total = 0
+
+    def _get(self, key):
+
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            return None
+
+        return self._entries[key]
+
+    def _set(self, key, value):
+
+        entries = self._entries
+
+        previous = entries.pop(key, None)
+
+        if previous is not None:
+            self._total -= len(previous)
+
+        entries[key] = value
+
+        self._total += len(value)
+
+        evictions = 0
+
+        while len(entries) > self._size or self._total > self._limit:
+            (key, value) = entries.popitem(last = False)
+            self._total -= len(value)
+            evictions += 1
+
+        return evictions
+
+    def clear(self):
+
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+class Disk(Base):
+
+    """
+    Keeps entries as files in the ``path`` directory.
+
+    Existing entries are picked up, oldest first, so the directory can be
+    shared across runs and processes. Failed writes leave nothing behind, and
+    those of crashed processes are removed once an hour old.
+    """
+
+    __slots__ = ('_path', '_entries', '_total')
+
+    _suffix = '.md4c'
+
+    _markers = (b's', b'b')
+
+    # entries being written, and how old they are when left behind by crashes
+    _partial = '.part'
+
+    _stale = 3600
+
+    def __init__(self, path, *args, **kwargs):
+
+        super().__init__(*args, **kwargs)
+
+        os.makedirs(path, exist_ok = True)
+
+        self._path = path
+
+        self._entries = collections.OrderedDict()
+
+        self._total = 0
+
+        names = os.listdir(path)
+
+        now = time.time()
+
+        for name in names:
+            if not name.endswith(self._partial):
+                continue
+            name = os.path.join(path, name)
+            try:
+                if now - os.stat(name).st_mtime > self._stale:
+                    self._remove(name)
+            except FileNotFoundError:
+                pass
+
+        names = [name for name in names if name.endswith(self._suffix)]
+
+        stats = [os.stat(os.path.join(path, name)) for name in names]
+
+        order = sorted(range(len(names)), key = lambda i: stats[i].st_mtime)
+
+        for index in order:
+            size = stats[index].st_size
+            self._entries[names[index]] = size
+            self._total += size
+
+    @property
+    def path(self):
+
+        return self._path
+
+    @staticmethod
+    def _remove(path):
+
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _name(self, key):
+
+        data = repr(key).encode()
+
+        name = hashlib.blake2b(data, digest_size = 20).hexdigest()
+
+        return name + self._suffix
+
+    def _get(self, key):
+
+        name = self._name(key)
+
+        path = os.path.join(self._path, name)
+
+        try:
+            with open(path, 'rb') as file:
+                value = file.read()
+        except FileNotFoundError:
+            self._entries.pop(name, None)
+            return None
+
+        # entries of other processes count from their first use here
+        size = len(value)
+
+        (marker, value) = (value[:1], value[1:])
+
+        if marker == self._markers[0]:
+            value = value.decode()
+
+        os.utime(path)
+
+        self._total += size - self._entries.pop(name, 0)
+
+        self._entries[name] = size
+
+        return value
+
+    def _set(self, key, value):
+
+        name = self._name(key)
+
+        if isinstance(value, str):
+            (marker, value) = (self._markers[0], value.encode())
+        else:
+            marker = self._markers[1]
+
+        (fileno, temp) = tempfile.mkstemp(suffix = self._partial, dir = self._path)
+
+        try:
+            with os.fdopen(fileno, 'wb') as file:
+                file.write(marker)
+                file.write(value)
+                size = file.tell()
+            os.replace(temp, os.path.join(self._path, name))
+        except BaseException:
+            self._remove(temp)
+            raise
+
+        self._total += size - self._entries.pop(name, 0)
+
+        self._entries[name] = size
+
+        evictions = 0
+
+        while len(self._entries) > self._size or self._total > self._limit:
+            (name, size) = self._entries.popitem(last = False)
+            self._total -= size
+            evictions += 1
+            self._remove(os.path.join(self._path, name))
+
+        return evictions
+
+    def clear(self):
+
+        with self._lock:
+            for name in self._entries:
+                self._remove(os.path.join(self._path, name))
+            self._entries.clear()
+            self._total = 0
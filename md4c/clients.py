@@ -1,9 +1,14 @@
 import sys, os
-import platform
+import io
+import mmap
+import stat
+import itertools
 
 from . import types
 from . import binds
 from . import flags
+from . import wraps
+from . import events
 from . import helpers
 
 
@@ -13,17 +18,66 @@ __all__ = ('load', 'Main')
 lib = None
 
 
+_keys = itertools.count(1)
+
+
+_variable = 'MD4C_LIBRARY'
+
+
+def _find():
+
+    # only needed once, so not worth importing with the package
+    import platform
+    import ctypes.util
+
+    path = os.environ.get(_variable)
+
+    if path:
+        return path
+
+    directory = os.path.dirname(__file__)
+
+    directory = os.path.join(directory, 'bin')
+
+    system = platform.system()
+
+    roots = (f'{system}-{platform.machine().lower()}', system)
+
+    names = sorted(os.listdir(directory))
+
+    for root in roots:
+        for name in names:
+            if os.path.splitext(name)[0] == root:
+                return os.path.join(directory, name)
+
+    path = ctypes.util.find_library('md4c')
+
+    if path:
+        return path
+
+    raise FileNotFoundError(f'Missing lib for "{system}" system')
+
+
 def load(path = None):
 
     """
     Load pre-build or custom libraries.
 
     :param str path:
-        Location of the dll or dylib.
+        Location of the dll, so or dylib.
+
+    Without ``path``, the ``MD4C_LIBRARY`` environment variable is used, then
+    ``bin/(system)-(machine)`` and ``bin/(system)`` files of the package,
+    then ``md4c`` as found by :func:`ctypes.util.find_library`.
+
+    The library must accept the ``api_version`` of the callbacks, otherwise
+    :class:`OSError` is raised before anything is parsed.
 
     .. note::
 
-        Only ``Dawin`` systems are supported out of the box.
+        Only ``Darwin`` systems are supported out of the box. Setting
+        ``MD4C_SOURCE`` to md4c's ``src`` directory when building the
+        package compiles one for the current system.
 
         Follow the project's `instructions <https://github.com/mity/md4c/wiki/Building-MD4C>`_ to build your own.
     """
@@ -34,18 +88,13 @@ def load(path = None):
         return
 
     if not path:
-        directory = os.path.dirname(__file__)
-        directory = os.path.join(directory, 'bin')
-        system = platform.system()
-        for name in os.listdir(directory):
-            (root, ext) = os.path.splitext(name)
-            if root == system:
-                break
-        else:
-            raise FileNotFoundError(f'Missing lib for "{system}" system')
-        path = os.path.join(directory, name)
+        path = _find()
 
-    lib = binds.load(path)
+    value = binds.load(path)
+
+    binds.check(value, Main._version)
+
+    lib = value
 
 
 class Main:
@@ -55,39 +104,324 @@ class Main:
 
     The ``options`` param can be ``flags`` and callbacks.
 
-    Valid callbacks are ``(enter/leave)_(block/span)`` and ``text``.
+    Valid callbacks are ``(enter/leave)_(block/span)`` and ``text``. With
+    ``userdata``, they receive the ``userdata`` passed to :meth:`parse`
+    before anything else, or its items with ``unpack``, so that plain
+    functions can be shared by many instances.
+
+    An ``interest`` mapping of callback names to collections of types limits
+    those callbacks to these types; other events are dropped before any
+    detail is read. A ``details`` collection of clause callback names limits
+    details to them; others receive ``None``.
+
+    With ``profile``, every parse fills a fresh :class:`~.profiles.Stats`,
+    available as :attr:`stats` until the next one starts.
+
+    A ``diagnostics`` :class:`~.diagnostics.Channel` receives the parser's
+    messages during the parses it accepts; others use plain callbacks.
+
+    With ``limits``, a :class:`~.limits.Limits`, parses going past them are
+    aborted and raise :class:`~.limits.Exceeded`.
+
+    With ``coalesce``, adjacent ``normal``, ``soft_br`` and ``entity`` text
+    reaches the ``text`` callback as one ``normal`` run, with entities
+    resolved; see :class:`~.runs.Coalescer`.
 
     Flags are used to (de)activate built-in derivates and extensions.
     """
 
-    __slots__ = ('_store', '_encoding')
+    __slots__ = (
+        '_store', '_encoding', '_recorder', '_profiler', '_diagnostics',
+        '_traced', '_limits', '_coalescer'
+    )
 
     _version = 0
 
-    def __init__(self, encoding = None, **options):
+    def __init__(self,
+                 encoding = None,
+                 profile = False,
+                 diagnostics = None,
+                 limits = None,
+                 coalesce = False,
+                 userdata = False,
+                 unpack = False,
+                 **options):
 
         load()
 
+        self._encoding = encoding or sys.getdefaultencoding()
+
+        self._limits = limits
+
+        self._coalescer = None
+
+        if coalesce:
+            from . import runs
+            self._coalescer = runs.Coalescer(self._encoding)
+
+        self._profiler = None
+
+        if profile:
+            from . import profiles
+            self._profiler = profiles.Profiler()
+
         self._store = binds.create(
             **options,
+            profiler = self._profiler,
+            limits = limits,
+            coalescer = self._coalescer,
+            userdata = userdata,
+            unpack = unpack,
             api_version = self._version
         )
 
-        self._encoding = encoding or sys.getdefaultencoding()
+        self._diagnostics = diagnostics
+
+        self._traced = diagnostics and binds.create(
+            **options,
+            profiler = self._profiler,
+            diagnostics = diagnostics,
+            limits = limits,
+            coalescer = self._coalescer,
+            userdata = userdata,
+            unpack = unpack,
+            api_version = self._version
+        )
+
+        self._recorder = None
 
     @property
     def encoding(self):
 
         return self._encoding
 
-    def parse(self, value):
+    @property
+    def flags(self):
+
+        return flags.Spec(self._store.flags)
+
+    @property
+    def diagnostics(self):
+
+        return self._diagnostics
+
+    @property
+    def limits(self):
+
+        return self._limits
+
+    @property
+    def profile(self):
+
+        return self._profiler is not None
+
+    @property
+    def stats(self):
+
+        """
+        The :class:`~.profiles.Stats` of the last parse, if profiling.
+        """
+
+        return self._profiler and self._profiler.stats
+
+    def parse(self, value, userdata = None):
 
         """
         Parse ``value`` with callbacks.
+
+        ``value`` can be a string, or any bytes-like object in
+        :attr:`encoding`, which is handed over without copying.
+
+        ``userdata`` is handed to every callback of this parse only, if this
+        client was created with ``userdata``, so the same callbacks can safely
+        serve concurrent or nested parses.
+
+        The first exception raised by a callback aborts the parse, and is
+        raised from here.
         """
 
-        size = len(value)
+        if isinstance(value, str):
+            value = value.encode(self._encoding)
+
+        return self._parse(value, userdata)
+
+    def _call(self, store, address, size, key):
+
+        result = helpers.c_call(lib.md_parse, address, size, store, key)
+
+        if self._coalescer and key not in wraps.errors:
+            self._coalescer.flush(key)
+
+        return result
+
+    def _parse(self, data, userdata, store = None):
+
+        (owner, address, size) = helpers.buffer(data)
+
+        key = next(_keys)
+
+        wraps.contexts[key] = userdata
+
+        token = wraps.token.get()
+
+        if token:
+            token.attach(key)
+
+        diagnostics = self._diagnostics
+
+        traced = not store and diagnostics and diagnostics.accept()
+
+        store = store or self._store
+
+        if traced:
+            store = self._traced
+            diagnostics.start(key, address, size)
+
+        limits = self._limits
+
+        if limits:
+            limits.start(key)
+
+        coalescer = self._coalescer
+
+        if coalescer:
+            coalescer.start(key)
+
+        try:
+            if not self._profiler:
+                return self._call(store, address, size, key)
+            with self._profiler.start():
+                return self._call(store, address, size, key)
+        finally:
+            if coalescer:
+                coalescer.stop(key)
+            del owner
+            error = wraps.release(key)
+            if traced:
+                diagnostics.stop(key)
+            if limits:
+                exceeded = limits.stop(key)
+                error = error or exceeded
+            if error:
+                raise error
+
+    async def aparse(self, value, userdata = None, pool = None, timeout = None):
+
+        """
+        Like :meth:`parse`, but in a thread of ``pool``, a
+        :class:`~.tasks.Pool`, without blocking the event loop.
+
+        Cancelling, or waiting for longer than ``timeout`` seconds, aborts the
+        parse.
+        """
+
+        from . import tasks
+
+        pool = pool or tasks.pool()
+
+        if pool.processes:
+            raise TypeError('callbacks cannot run in other processes')
+
+        return await pool.run(self.parse, value, userdata, timeout = timeout)
+
+    def parse_file(self, file, userdata = None):
+
+        """
+        Parse the contents of ``file``, a path or file object, with callbacks.
+
+        Files are memory mapped and handed to the parser as they are, so they
+        should be in :attr:`encoding`. Objects without a ``fileno``, pipes,
+        sockets and terminals are read.
+        """
+
+        if isinstance(file, (str, bytes, os.PathLike)):
+            with open(file, 'rb') as file:
+                return self.parse_file(file, userdata)
+
+        try:
+            info = os.fstat(file.fileno())
+        except (AttributeError, io.UnsupportedOperation):
+            info = None
+
+        if not (info and stat.S_ISREG(info.st_mode)):
+            data = file.read()
+            if isinstance(data, str):
+                data = data.encode(self._encoding)
+            return self._parse(data, userdata)
+
+        fileno = file.fileno()
+
+        size = info.st_size
+
+        if not size:
+            return self._parse(b'', userdata)
+
+        with mmap.mmap(fileno, size, access = mmap.ACCESS_COPY) as data:
+            return self._parse(data, userdata)
+
+    def parse_stream(self, chunks, userdata = None):
+
+        """
+        Parse the joined ``chunks``, strings or bytes, with callbacks.
+
+        Chunks are spooled into a temporary file as they arrive, so the whole
+        input is never held in memory.
+        """
+
+        import tempfile
+
+        with tempfile.TemporaryFile() as file:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(self._encoding)
+                file.write(chunk)
+            file.flush()
+            return self.parse_file(file, userdata)
+
+    def record(self, value):
+
+        """
+        Parse ``value`` into an :class:`~.events.Buffer`.
+
+        Callbacks are not invoked; events are stored compactly instead, so
+        they can be walked later in one pass. Offsets point into a
+        :class:`bytes` copy of ``value``, unless it already is one.
+
+        Errors while recording abort the parse and are raised from here, and
+        so is :class:`~.limits.Exceeded` with :attr:`limits`. Recording is
+        profiled and coalesced like other parses, but never diagnosed.
+        """
+
+        if isinstance(value, str):
+            value = value.encode(self._encoding)
+
+        data = bytes(value)
+
+        recorder = self._recorder
+
+        if not recorder:
+            recorder = self._recorder = events.Recorder(
+                api_version = self._version,
+                flags = self._store.flags,
+                profiler = self._profiler,
+                limits = self._limits,
+                coalescer = self._coalescer
+            )
+
+        (data, address, size) = helpers.buffer(data)
+
+        recording = recorder.start(data, address)
+
+        self._parse(data, recording, recorder.store)
+
+        return recording.buffer
+
+    def events(self, value):
+
+        """
+        Parse ``value`` into an :class:`~.events.Stream`.
+        """
 
-        value = value.encode(self._encoding)
+        buffer = self.record(value)
 
-        return helpers.c_call(lib.md_parse, value, size, self._store, 0)
+        return events.Stream.from_buffer(buffer)
@@ -1,3 +1,4 @@
+import html
 import ctypes
 import functools
 
@@ -6,12 +7,57 @@ from . import enums
 
 
 __all__ = ('Attribute', 'Ul', 'Ol', 'Li', 'H', 'Code', 'Td', 'A', 'Img',
-           'WikiLink')
+           'WikiLink', 'decode')
 
 
 _Base = ctypes.Structure
 
 
+class _Plain:
+
+    """
+    Detached copy of a detail, holding python values only.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+
+        for (name, value) in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def __reduce__(self):
+
+        values = tuple(getattr(self, name) for name in self.__slots__)
+
+        return (self.__class__, values)
+
+    def detach(self):
+
+        """
+        Get a copy, like details do.
+        """
+
+        (cls, values) = self.__reduce__()
+
+        return cls(*values)
+
+    def __eq__(self, other):
+
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+
+        return self.__reduce__() == other.__reduce__()
+
+    def __repr__(self):
+
+        values = ', '.join(
+            f'{name}={getattr(self, name)!r}' for name in self.__slots__
+        )
+
+        return f'{self.__class__.__name__}({values})'
+
+
 class _Meta(_Base.__class__):
 
     _types = {
@@ -38,6 +84,22 @@ class _Meta(_Base.__class__):
         ctypes.c_void_p    : int
     }
 
+    def __init__(self, name, bases, namespace):
+
+        super().__init__(name, bases, namespace)
+
+        fields = namespace.get('_fields_', ())
+
+        self.Plain = type(
+            name,
+            (_Plain,),
+            {
+                '__slots__': tuple(field for (field, c_type) in fields),
+                '__module__': self.__module__,
+                '__qualname__': f'{name}.Plain'
+            }
+        )
+
     @property
     def __doc__(self):
 
@@ -51,6 +113,8 @@ class _Meta(_Base.__class__):
                 buffer = ':class:`'
                 if issubclass(value, _Base):
                     buffer += '.'
+                elif issubclass(value, ctypes._Pointer):
+                    value = tuple
                 else:
                     value = self._types[value]
                 return f'{buffer}{value.__name__}`\\'
@@ -81,6 +145,22 @@ class Detail(_Base, metaclass = _Meta):
 
     _fields_ = ()
 
+    def detach(self):
+
+        """
+        Get a :attr:`Plain` copy that remains valid after the callback.
+        """
+
+        values = []
+
+        for (name, c_type) in self._fields_:
+            value = getattr(self, name)
+            if isinstance(value, Detail):
+                value = value.detach()
+            values.append(value)
+
+        return self.Plain(*values)
+
 
 class Attribute(Detail):
 
@@ -89,19 +169,45 @@ class Attribute(Detail):
     within various detailed structures, but still may contain string portions
     of different types like e.g. entities.
 
-    n/a
-    n/a
-    n/a
-    n/a
+    Not null-terminated; use :func:`decode` to get its value.
+    Length of ``text``.
+    The :class:`~.enums.Text` of each substring.
+    Offset of each substring, followed by ``size``.
     """
 
     _fields_ = (
-        ('text'          , types.char_p),
-        ('size'          , types.size  ),
-        ('substr_types'  , types.enum  ),
-        ('substr_offsets', types.offset)
+        ('text'          , types.char_p                 ),
+        ('size'          , types.size                   ),
+        ('substr_types'  , ctypes.POINTER(types.enum)   ),
+        ('substr_offsets', ctypes.POINTER(types.offset) )
     )
 
+    def detach(self):
+
+        field = ctypes.addressof(self) + self.__class__.text.offset
+        address = ctypes.c_void_p.from_address(field).value
+        text = ctypes.string_at(address, self.size) if address else b''
+
+        offsets = []
+
+        if self.substr_offsets:
+            for index in range(self.size + 1):
+                offset = self.substr_offsets[index]
+                offsets.append(offset)
+                if offset >= self.size:
+                    break
+
+        substr_types = self.substr_types
+
+        if substr_types:
+            substr_types = substr_types[:len(offsets) - 1]
+        else:
+            substr_types = ()
+
+        values = (text, self.size, tuple(substr_types), tuple(offsets))
+
+        return self.Plain(*values)
+
 
 class Ul(Detail):
 
@@ -236,3 +342,50 @@ class WikiLink(Detail):
     _fields_ = (
         ('target', Attribute),
     )
+
+
+_substrings = {
+    enums.Text.normal  : lambda data: data,
+    enums.Text.entity  : html.unescape,
+    enums.Text.nullchar: lambda data: '\ufffd'
+}
+
+
+@functools.lru_cache(maxsize = 4096)
+def _decode(text, substr_types, substr_offsets, encoding):
+
+    if not any(substr_types):
+        return text.decode(encoding)
+
+    parts = []
+
+    bounds = zip(substr_offsets, substr_offsets[1:])
+
+    for (type, (start, end)) in zip(substr_types, bounds):
+        data = text[start:end].decode(encoding)
+        data = _substrings.get(type, _substrings[enums.Text.normal])(data)
+        parts.append(data)
+
+    return ''.join(parts)
+
+
+def decode(attribute, encoding):
+
+    """
+    Get the value of an :class:`Attribute` or its plain copy.
+
+    Only ``size`` bytes are read and entities are resolved. Recent values are
+    kept, so repeated values are the same string object.
+    """
+
+    if isinstance(attribute, Attribute):
+        attribute = attribute.detach()
+
+    values = (
+        attribute.text,
+        attribute.substr_types,
+        attribute.substr_offsets,
+        encoding
+    )
+
+    return _decode(*values)
@@ -0,0 +1,199 @@
+import time
+import random
+import threading
+import collections
+
+from . import wraps
+
+
+__all__ = ('Diagnostic', 'Channel')
+
+
+class Diagnostic:
+
+    """
+    One message from the parser.
+
+    ``kind`` is ``'debug'`` for ``debug_log`` messages and ``'syntax'`` for
+    the ``syntax`` callback, which carries none. ``offset`` is the position
+    in the source right after the latest text, if tracked.
+    """
+
+    __slots__ = ('kind', 'message', 'offset')
+
+    def __init__(self, kind, message, offset = None):
+
+        self.kind = kind
+
+        self.message = message
+
+        self.offset = offset
+
+    def as_dict(self):
+
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+
+        values = ', '.join(
+            f'{key}={value!r}' for (key, value) in self.as_dict().items()
+        )
+
+        return f'{self.__class__.__name__}({values})'
+
+
+class Channel:
+
+    """
+    Structured stream of parser diagnostics.
+
+    Every :class:`Diagnostic` is passed to ``handler``, if any, and kept in
+    :attr:`records`, which holds the last ``size`` of them.
+
+    Only a ``sample`` fraction of parses is diagnosed, and none while more
+    than ``rate`` diagnostics per second have been emitted; the rest run
+    without any diagnostic callbacks. Diagnostics over the ``rate`` during a
+    parse are counted in :attr:`dropped`.
+
+    With ``offsets``, text events of diagnosed parses track their position
+    in the source, so diagnostics carry it.
+    """
+
+    __slots__ = (
+        '_handler', '_sample', '_rate', '_offsets', '_allowance', '_stamp',
+        '_positions', '_lock', 'records', 'dropped'
+    )
+
+    def __init__(self,
+                 handler = None,
+                 sample = 1.0,
+                 rate = None,
+                 offsets = False,
+                 size = 256):
+
+        self._handler = handler
+
+        self._sample = sample
+
+        self._rate = rate
+
+        self._offsets = offsets
+
+        self._allowance = rate
+
+        self._stamp = time.monotonic()
+
+        self._positions = {}
+
+        self._lock = threading.Lock()
+
+        self.records = collections.deque(maxlen = size)
+
+        self.dropped = 0
+
+    @property
+    def offsets(self):
+
+        return self._offsets
+
+    def _refill(self):
+
+        now = time.monotonic()
+
+        allowance = self._allowance + (now - self._stamp) * self._rate
+
+        self._allowance = min(allowance, self._rate)
+
+        self._stamp = now
+
+    def accept(self):
+
+        """
+        Whether to diagnose the next parse.
+        """
+
+        if self._sample < 1 and random.random() >= self._sample:
+            return False
+
+        if self._rate is None:
+            return True
+
+        with self._lock:
+            self._refill()
+            return self._allowance >= 1
+
+    def start(self, key, address, size):
+
+        self._positions[key] = [address, size, None]
+
+    def stop(self, key):
+
+        del self._positions[key]
+
+    def _emit(self, kind, message, udata):
+
+        if self._rate is not None:
+            with self._lock:
+                self._refill()
+                if self._allowance < 1:
+                    self.dropped += 1
+                    return
+                self._allowance -= 1
+
+        offset = None
+
+        position = self._positions.get(udata)
+
+        if position:
+            (address, size, last) = position
+            if last is not None:
+                offset = last - address
+
+        if message is not None:
+            message = message.decode('utf-8', 'replace')
+
+        diagnostic = Diagnostic(kind, message, offset)
+
+        self.records.append(diagnostic)
+
+        if self._handler:
+            self._handler(diagnostic)
+
+    def debug_log(self, message, udata):
+
+        """
+        The raw ``debug_log`` callback.
+        """
+
+        try:
+            self._emit('debug', message, udata)
+        except BaseException as error:
+            wraps.errors.setdefault(udata, error)
+
+    def syntax(self, *args):
+
+        """
+        The raw ``syntax`` callback.
+
+        .. note::
+
+            Upstream md4c reserves it and never calls it, nor passes userdata.
+        """
+
+        self._emit('syntax', None, None)
+
+    def trampoline(self, func):
+
+        """
+        Track the source position of text events, then call ``func``.
+        """
+
+        positions = self._positions
+
+        def wrapper(type, data, size, udata):
+            position = positions.get(udata)
+            if position and 0 <= data - position[0] <= position[1]:
+                position[2] = data + size
+            return func(type, data, size, udata)
+
+        return wrapper
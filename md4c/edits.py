@@ -0,0 +1,226 @@
+import re
+import array
+
+from . import enums
+from . import events
+
+
+__all__ = ('Editor',)
+
+
+_fence = re.compile(r' {0,3}(`{3,}|~{3,})')
+
+
+_item = re.compile(r' {0,3}(?:[-+*]|\d{1,9}[.)])(?:[ \t]|$)')
+
+
+_define = re.compile(
+    r' {0,3}\[(?:[^\[\]\\]|\\.)+\]:[ \t]*(?:\r?\n|\r)?[ \t]*(?:<[^<>\r\n]*>|\S+)'
+    r'(?:(?:[ \t]+|[ \t]*(?:\r?\n|\r)[ \t]*)'
+    r'(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|\((?:[^()\\]|\\.)*\))'
+    r'[ \t]*(?:\r?\n|\r|$)|[ \t]*(?:\r?\n|\r|$))'
+)
+
+
+_html = re.compile(r' {0,3}<(!--|script|pre|style|textarea)', re.IGNORECASE)
+
+
+_closers = {
+    '!--'     : '-->',
+    'script'  : '</script>',
+    'pre'     : '</pre>',
+    'style'   : '</style>',
+    'textarea': '</textarea>'
+}
+
+
+def _split(value):
+
+    """
+    Get the top-level blocks of ``value`` and its link reference definitions.
+
+    Blocks are split at blank lines, except within fenced code and raw html,
+    before indented lines and between items of the same list. Definitions
+    may span lines, but cannot interrupt paragraphs.
+    """
+
+    blocks = []
+
+    defines = []
+
+    lines = []
+
+    first = None
+
+    fence = closer = None
+
+    blank = defining = False
+
+    rows = value.splitlines(True)
+
+    (index, offset) = (0, 0)
+
+    while index < len(rows):
+        line = rows[index]
+        start = offset
+        offset += len(line)
+        index += 1
+        if fence:
+            lines.append(line)
+            match = _fence.match(line)
+            if match:
+                mark = match.group(1)
+                if mark[0] == fence[0] and len(mark) >= len(fence):
+                    fence = None
+            continue
+        if closer:
+            lines.append(line)
+            if closer in line.lower():
+                closer = None
+            continue
+        if not line.strip():
+            blank = True
+            lines.append(line)
+            continue
+        if blank and first and line[0] not in ' \t':
+            if not (_item.match(first) and _item.match(line)):
+                blocks.append(''.join(lines))
+                lines.clear()
+                first = None
+        blank = False
+        if not first or defining:
+            match = _define.match(value, start)
+            if match:
+                while offset < match.end():
+                    offset += len(rows[index])
+                    line += rows[index]
+                    index += 1
+                lines.append(line)
+                defines.append(line)
+                first = first or line
+                defining = True
+                continue
+        defining = False
+        lines.append(line)
+        if not first:
+            first = line
+        match = _fence.match(line)
+        if match:
+            fence = match.group(1)
+            continue
+        match = _html.match(line)
+        if match:
+            closer = _closers[match.group(1).lower()]
+            if closer in line[match.end():].lower():
+                closer = None
+
+    if lines:
+        blocks.append(''.join(lines))
+
+    defines = ''.join(defines)
+
+    if defines and not defines.endswith(('\n', '\r')):
+        defines += '\n'
+
+    return (blocks, defines)
+
+
+class Editor:
+
+    """
+    Renders successive versions of a document through ``parser``, only
+    re-rendering the top-level blocks that changed since the last call.
+
+    Link reference definitions are added before every block, and changing
+    any of them re-renders everything. Blocks are placed between what the
+    parser renders for entering and leaving the document.
+
+    .. note::
+
+        Results match rendering the whole document for parsers whose blocks
+        render independently, like :class:`~.parsers.Html` and
+        :class:`~.parsers.Markup`.
+    """
+
+    __slots__ = ('_parser', '_head', '_tail', '_blocks', '_defines')
+
+    # rendered as the only text of a document, to find where blocks go
+    _mark = b'md4cEditorMark'
+
+    def __init__(self, parser):
+
+        self._parser = parser
+
+        (self._head, self._tail) = self._frame()
+
+        self._blocks = {}
+
+        self._defines = ''
+
+    @property
+    def parser(self):
+
+        return self._parser
+
+    def _frame(self):
+
+        mark = self._mark
+
+        size = len(mark)
+
+        records = array.array('I', (
+            enums.Event.enter_block, enums.Block.doc  , 0   , 0   , 0,
+            enums.Event.text       , enums.Text.normal, 0   , size, 0,
+            enums.Event.leave_block, enums.Block.doc  , size, 0   , 0
+        ))
+
+        value = self._parser.replay(events.Buffer(mark, records))
+
+        (head, found, tail) = value.partition(mark.decode())
+
+        if not found:
+            raise ValueError('parser does not render text of the document')
+
+        return (head, tail)
+
+    def _render(self, block):
+
+        if self._defines:
+            block = self._defines + '\n' + block
+
+        value = self._parser.get(block)
+
+        end = len(value) - len(self._tail)
+
+        return value[len(self._head):end]
+
+    def get(self, value):
+
+        """
+        Get the result for ``value``.
+        """
+
+        (blocks, defines) = _split(value)
+
+        if defines != self._defines:
+            self._defines = defines
+            self._blocks.clear()
+
+        cache = self._blocks
+
+        results = {}
+
+        for block in blocks:
+            if block in results:
+                continue
+            try:
+                result = cache[block]
+            except KeyError:
+                result = self._render(block)
+            results[block] = result
+
+        self._blocks = results
+
+        parts = (results[block] for block in blocks)
+
+        return self._head + ''.join(parts) + self._tail
@@ -3,7 +3,7 @@ import functools
 from . import abc
 
 
-__all__ = ('Block', 'Span', 'Text', 'Align')
+__all__ = ('Block', 'Span', 'Text', 'Align', 'Event')
 
 
 Block = abc.Enum(
@@ -32,3 +32,10 @@ Align = abc.Enum(
     'default left center right',
     start = 0
 )
+
+
+Event = abc.Enum(
+    'Event',
+    'enter_block leave_block enter_span leave_span text',
+    start = 0
+)
@@ -0,0 +1,394 @@
+import array
+import ctypes
+
+from . import enums
+from . import binds
+from . import wraps
+
+
+__all__ = ('Buffer', 'Stream')
+
+
+class Buffer:
+
+    """
+    Compact record of every event emitted while parsing.
+
+    Records are stored back to back in :attr:`records` as ``kind``, ``type``,
+    ``offset``, ``size`` and ``detail`` unsigned integers, where ``kind`` is an
+    :class:`~.enums.Event` and ``type`` is the respective enum's value.
+
+    Text points to ``size`` bytes at ``offset`` within :attr:`data`. Text that
+    is not part of the source (like soft breaks) is kept in :attr:`details`
+    instead, and so are the :attr:`~.details.Detail.Plain` copies of details.
+    ``detail`` is the index of such value plus one, or ``0`` for none. Block
+    and span offsets are the end of the text preceding them.
+    """
+
+    __slots__ = ('_data', '_records', '_details')
+
+    width = 5
+
+    def __init__(self, data, records = None, details = None):
+
+        self._data = data
+
+        self._records = array.array('I') if records is None else records
+
+        self._details = [] if details is None else details
+
+    @property
+    def data(self):
+
+        return self._data
+
+    @property
+    def records(self):
+
+        return self._records
+
+    @property
+    def details(self):
+
+        return self._details
+
+    def __len__(self):
+
+        return len(self._records) // self.width
+
+    def __iter__(self):
+
+        return zip(*(iter(self._records),) * self.width)
+
+    def get(self, offset, size, detail):
+
+        """
+        Get the text or detail of a record.
+        """
+
+        if detail:
+            return self._details[detail - 1]
+
+        if size:
+            return self._data[offset:offset + size]
+
+        return None
+
+
+class Stream:
+
+    """
+    Columnar form of a :class:`Buffer`.
+
+    Each event is spread over :attr:`kinds`, :attr:`types`, :attr:`offsets`,
+    :attr:`sizes` and :attr:`details`, all arrays of equal length, so they can
+    be filtered or counted without creating an object per event. Text is
+    sliced from :attr:`source` without copying.
+
+    Pickling only serializes the data and the arrays.
+    """
+
+    __slots__ = ('_data', '_source', '_kinds', '_types', '_offsets', '_sizes',
+                 '_details', '_objects', '_codes')
+
+    _shift = 5
+
+    def __init__(self, data, kinds, types, offsets, sizes, details, objects):
+
+        self._data = data
+
+        self._source = memoryview(data)
+
+        self._kinds = kinds
+
+        self._types = types
+
+        self._offsets = offsets
+
+        self._sizes = sizes
+
+        self._details = details
+
+        self._objects = objects
+
+        self._codes = None
+
+    @classmethod
+    def from_buffer(cls, buffer):
+
+        """
+        Split the records of ``buffer`` into columns.
+        """
+
+        records = buffer.records
+
+        width = buffer.width
+
+        columns = (records[index::width] for index in range(width))
+
+        (kinds, types, offsets, sizes, details) = columns
+
+        kinds = array.array('B', kinds)
+
+        types = array.array('B', types)
+
+        return cls(buffer.data, kinds, types, offsets, sizes, details,
+                   buffer.details)
+
+    def __reduce__(self):
+
+        values = (
+            self._data,
+            self._kinds,
+            self._types,
+            self._offsets,
+            self._sizes,
+            self._details,
+            self._objects
+        )
+
+        return (self.__class__, values)
+
+    @property
+    def data(self):
+
+        return self._data
+
+    @property
+    def source(self):
+
+        return self._source
+
+    @property
+    def kinds(self):
+
+        return self._kinds
+
+    @property
+    def types(self):
+
+        return self._types
+
+    @property
+    def offsets(self):
+
+        return self._offsets
+
+    @property
+    def sizes(self):
+
+        return self._sizes
+
+    @property
+    def details(self):
+
+        return self._details
+
+    @property
+    def objects(self):
+
+        return self._objects
+
+    def __len__(self):
+
+        return len(self._kinds)
+
+    def __iter__(self):
+
+        columns = (self._kinds, self._types, self._offsets, self._sizes,
+                   self._details)
+
+        return zip(*columns)
+
+    def get(self, offset, size, detail):
+
+        """
+        Get the text or detail of an event.
+        """
+
+        if detail:
+            return self._objects[detail - 1]
+
+        if size:
+            return self._source[offset:offset + size]
+
+        return None
+
+    def text(self, index):
+
+        """
+        Get the text of the event at ``index`` without copying.
+        """
+
+        return self.get(self._offsets[index], self._sizes[index],
+                        self._details[index])
+
+    def _code(self, kind, type):
+
+        if self._codes is None:
+            shift = self._shift
+            self._codes = bytes(
+                kind << shift | type
+                for (kind, type) in zip(self._kinds, self._types)
+            )
+
+        return (kind << self._shift | type).to_bytes(1, 'little')
+
+    def count(self, kind, type = None):
+
+        """
+        Count the events of ``kind``, optionally only those of ``type``.
+        """
+
+        if type is None:
+            return self._kinds.tobytes().count(kind)
+
+        code = self._code(kind, type)
+
+        return self._codes.count(code)
+
+    def where(self, kind, type = None):
+
+        """
+        Get the indexes of events of ``kind``, optionally only of ``type``.
+        """
+
+        if type is None:
+            values = self._kinds.tobytes()
+            code = int(kind).to_bytes(1, 'little')
+        else:
+            code = self._code(kind, type)
+            values = self._codes
+
+        indexes = array.array('I')
+
+        index = values.find(code)
+
+        while index >= 0:
+            indexes.append(index)
+            index = values.find(code, index + 1)
+
+        return indexes
+
+
+_kinds = tuple(map(int, enums.Event))
+
+
+class _Recording:
+
+    __slots__ = ('buffer', 'start', 'end', 'cursor', 'stack')
+
+    def __init__(self, data, address):
+
+        self.buffer = Buffer(data)
+
+        self.start = address
+
+        self.end = address + len(data)
+
+        self.cursor = 0
+
+        self.stack = []
+
+
+def _clause(kind, classes, leave):
+
+    def callback(type, address, udata):
+        if udata in wraps.errors:
+            return 1
+        try:
+            recording = wraps.contexts[udata]
+            if leave:
+                detail = recording.stack.pop()
+            else:
+                detail = 0
+                if address:
+                    cls = classes.get(type)
+                    if cls:
+                        details = recording.buffer._details
+                        details.append(cls.from_address(address).detach())
+                        detail = len(details)
+                recording.stack.append(detail)
+            records = (kind, type, recording.cursor, 0, detail)
+            recording.buffer._records.extend(records)
+        except BaseException as error:
+            wraps.errors.setdefault(udata, error)
+            return 1
+        return 0
+
+    return callback
+
+
+def _text(type, address, size, udata):
+
+    if udata in wraps.errors:
+        return 1
+
+    try:
+        recording = wraps.contexts[udata]
+        offset = address - recording.start
+        if 0 <= offset and address + size <= recording.end:
+            detail = 0
+            recording.cursor = offset + size
+        else:
+            details = recording.buffer._details
+            details.append(ctypes.string_at(address, size))
+            detail = len(details)
+            offset = recording.cursor
+        records = (_kinds[4], type, offset, size, detail)
+        recording.buffer._records.extend(records)
+    except BaseException as error:
+        wraps.errors.setdefault(udata, error)
+        return 1
+
+    return 0
+
+
+class Recorder:
+
+    """
+    Fills :class:`Buffer` objects by parsing.
+
+    The state of every parse is the context of its ``userdata`` in
+    ``wraps.contexts``, so one recorder serves any number of parses at once.
+    Like other callbacks, the first exception aborts the parse and is kept in
+    ``wraps.errors`` under its ``userdata``. A ``profiler``, ``limits`` and a
+    ``coalescer`` wrap the callbacks as they do for :func:`~.binds.create`.
+    """
+
+    __slots__ = ('_store',)
+
+    def __init__(self, profiler = None, limits = None, coalescer = None, **options):
+
+        callbacks = {
+            'enter_block': _clause(_kinds[0], wraps._block_details, False),
+            'leave_block': _clause(_kinds[1], wraps._block_details, True),
+            'enter_span' : _clause(_kinds[2], wraps._span_details, False),
+            'leave_span' : _clause(_kinds[3], wraps._span_details, True),
+            'text'       : _text
+        }
+
+        for (name, func) in callbacks.items():
+            if profiler:
+                func = profiler.trampoline(name, func)
+            if limits:
+                func = limits.trampoline(name, func)
+            if coalescer:
+                func = coalescer.trampoline(name, func)
+            callbacks[name] = func
+
+        self._store = binds.assemble(**options, **callbacks)
+
+    @property
+    def store(self):
+
+        return self._store
+
+    def start(self, data, address):
+
+        """
+        Get the context for parsing ``data`` located at ``address``, whose
+        ``buffer`` is being filled.
+        """
+
+        return _Recording(data, address)
@@ -1,3 +1,4 @@
+import ctypes
 
 
 __all__ = ()
@@ -8,13 +9,24 @@ def c_call(func, *args):
     return func(*(cls(arg) for (cls, arg) in zip(func.argtypes, args)))
 
 
-def enum_cb(cls, spot = 0):
+def buffer(value):
 
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            args = list(args)
-            args[spot] = cls(args[spot])
-            return func(*args, **kwargs)
-        return wrapper
+    """
+    Get an object keeping bytes-like ``value`` alive, its address and size.
+
+    Only read-only buffers other than :class:`bytes` are copied.
+    """
+
+    if isinstance(value, bytes):
+        address = ctypes.cast(value, ctypes.c_void_p).value
+        return (value, address, len(value))
+
+    view = memoryview(value)
+
+    if view.readonly:
+        return buffer(view.tobytes())
+
+    owner = (ctypes.c_char * view.nbytes).from_buffer(view)
+
+    return (owner, ctypes.addressof(owner), view.nbytes)
 
-    return decorator
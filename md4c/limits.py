@@ -0,0 +1,148 @@
+import time
+
+
+__all__ = ('Exceeded', 'Limits')
+
+
+_clock = time.perf_counter
+
+
+class Exceeded(Exception):
+
+    """
+    A parse went past one of its :class:`Limits`.
+
+    ``limit`` names it, and ``stats`` holds what the parse reached so far:
+    ``events``, ``depth`` (the deepest nesting), ``output`` and ``time``.
+    """
+
+    def __init__(self, limit, stats):
+
+        super().__init__(limit, stats)
+
+        self.limit = limit
+
+        self.stats = stats
+
+    def __str__(self):
+
+        return f'parse exceeded its {self.limit} limit at {self.stats}'
+
+
+class _Guard:
+
+    __slots__ = ('events', 'depth', 'deepest', 'output', 'start', 'limit')
+
+    def __init__(self):
+
+        self.events = self.depth = self.deepest = self.output = 0
+
+        self.start = _clock()
+
+        self.limit = None
+
+    def stats(self):
+
+        return {
+            'events': self.events,
+            'depth' : self.deepest,
+            'output': self.output,
+            'time'  : _clock() - self.start
+        }
+
+
+class Limits:
+
+    """
+    Bounds of every parse; ``None`` means unbounded.
+
+    :param float time:
+        Seconds of wall time.
+    :param int events:
+        Callback events.
+    :param int depth:
+        Nested blocks and spans.
+    :param int output:
+        Bytes of text handed to callbacks, which is what renderers copy.
+
+    Limits are checked on every event, aborting the parse through the
+    callback's return value. Time spent in the library between two events
+    cannot be interrupted.
+    """
+
+    __slots__ = ('time', 'events', 'depth', 'output', '_guards')
+
+    def __init__(self, time = None, events = None, depth = None, output = None):
+
+        self.time = time
+
+        self.events = events
+
+        self.depth = depth
+
+        self.output = output
+
+        self._guards = {}
+
+    def start(self, key):
+
+        self._guards[key] = _Guard()
+
+    def stop(self, key):
+
+        """
+        Forget the parse under ``key``, getting :class:`Exceeded` if it was
+        aborted.
+        """
+
+        guard = self._guards.pop(key)
+
+        return guard.limit and Exceeded(guard.limit, guard.stats())
+
+    def _check(self, guard, step, size):
+
+        guard.events += 1
+
+        guard.depth += step
+
+        guard.output += size
+
+        if guard.depth > guard.deepest:
+            guard.deepest = guard.depth
+
+        if self.events is not None and guard.events > self.events:
+            guard.limit = 'events'
+        elif self.depth is not None and guard.depth > self.depth:
+            guard.limit = 'depth'
+        elif self.output is not None and guard.output > self.output:
+            guard.limit = 'output'
+        elif self.time is not None and _clock() - guard.start > self.time:
+            guard.limit = 'time'
+        else:
+            return 0
+
+        return 1
+
+    def trampoline(self, name, func):
+
+        """
+        Check limits before calling ``func``, as called by the library.
+        """
+
+        guards = self._guards
+
+        check = self._check
+
+        if name == 'text':
+            def wrapper(type, data, size, udata):
+                if check(guards[udata], 0, size):
+                    return 1
+                return func(type, data, size, udata)
+        else:
+            step = 1 if name.startswith('enter') else - 1
+            def wrapper(type, detail, udata):
+                if check(guards[udata], step, 0):
+                    return 1
+                return func(type, detail, udata)
+
+        return wrapper
@@ -0,0 +1,96 @@
+
+__all__ = ('Node', 'Text')
+
+
+class Node:
+
+    """
+    A block or span of the document.
+
+    :param type:
+        The :class:`~.enums.Block` or :class:`~.enums.Span`.
+    :param detail:
+        The :attr:`~.details.Detail.Plain` copy of its detail, if any.
+    :param start:
+        The offset of its first text in the source, if known.
+    :param end:
+        The offset after its last text in the source, if known.
+    """
+
+    __slots__ = ('type', 'detail', 'children', 'start', 'end')
+
+    def __init__(self, type, detail = None, start = None, end = None):
+
+        self.type = type
+
+        self.detail = detail
+
+        self.children = []
+
+        self.start = start
+
+        self.end = end
+
+    def walk(self):
+
+        """
+        Yield this and all nested nodes, depth first.
+        """
+
+        yield self
+
+        for child in self.children:
+            yield from child.walk()
+
+    @property
+    def text(self):
+
+        """
+        The joined value of all nested :class:`Text`.
+        """
+
+        return ''.join(node.text for node in self.children)
+
+    def __repr__(self):
+
+        return (
+            f'{self.__class__.__name__}({self.type!r}, {self.detail!r}, '
+            f'children={len(self.children)})'
+        )
+
+
+class Text:
+
+    """
+    A run of text.
+
+    :param type:
+        The :class:`~.enums.Text`.
+    :param value:
+        The decoded text.
+    :param offset:
+        The offset of the text in the source, if it is part of it.
+    """
+
+    __slots__ = ('type', 'value', 'offset')
+
+    def __init__(self, type, value, offset = None):
+
+        self.type = type
+
+        self.value = value
+
+        self.offset = offset
+
+    def walk(self):
+
+        yield self
+
+    @property
+    def text(self):
+
+        return self.value
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}({self.type!r}, {self.value!r})'
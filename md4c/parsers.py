@@ -1,12 +1,48 @@
+import io
 import abc
+import csv
+import html
+import json
 import shutil
+import hashlib
+import functools
+import importlib
 
+from . import enums
 from . import flags
+from . import nodes
 from . import clients
 from . import details
 
 
-__all__ = ('Base', 'Html', 'Ansi')
+__all__ = ('Base', 'Tree', 'Html', 'Markup', 'Ansi', 'Tables')
+
+
+def _require(name):
+
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise ImportError(f'missing "{name}" module') from None
+
+
+class _Encoder:
+
+    """
+    Writes text to a binary file.
+    """
+
+    __slots__ = ('_file', '_encoding')
+
+    def __init__(self, file, encoding):
+
+        self._file = file
+
+        self._encoding = encoding
+
+    def write(self, data):
+
+        return self._file.write(data.encode(self._encoding))
 
 
 class Base(abc.ABC):
@@ -15,32 +51,97 @@ class Base(abc.ABC):
     Source for all parsers.
 
     For custom parsers, overwrite :meth:`_leave`, :meth:`_track`, and
-    :meth:`_get`. Create a ``_parse_(tag)`` method for every handled tag.
-    All valid tags can be found in :class:`~.enums.Block` and
-    :class:`~.enums.Span` with trailing underscores stripped.
+    :meth:`_get`. Create a ``_parse_(tag)`` method for every handled tag,
+    and a ``_leave_(tag)`` method, taking the arguments of :meth:`_leave`,
+    for tags that need more than it when exiting. All valid tags can be
+    found in :class:`~.enums.Block` and :class:`~.enums.Span` with trailing
+    underscores stripped. Handlers are resolved once per class, when it is
+    created, and entering or leaving tags without one never reaches python
+    code beyond the callback. Details are only available when entering tags.
+
+    Every call of :meth:`get` renders into a fresh ``_State``, which is passed
+    to all of the above, so one parser can be used by many threads at once or
+    re-entered from its own methods. Parsers of a class with the same flags
+    share one :attr:`client`, unless profiled, diagnosed or limited, and
+    receive themselves and their state through its ``userdata``.
+
+    Results of :meth:`get` are stored in ``cache``, if any; see
+    :mod:`~.caches`. With ``profile``, the :attr:`~.clients.Main.stats` of
+    :attr:`client` time each handler against the library. ``diagnostics``
+    is a :class:`~.diagnostics.Channel` for the parser's messages, and
+    ``limits`` bound every render; see :mod:`~.limits`. ``coalesce`` merges
+    text runs before they reach :meth:`_track`.
 
     Flags: ``strike_through`` | ``underline``.
     """
 
-    __slots__ = ('_client',)
+    __slots__ = ('_client', '_cache', '_args', '_options')
+
+    _State = None
+
+    # clients without per-parser options, shared by all parsers of a class
+    _clients = {}
 
     flags = flags.Spec.strike_through | flags.Spec.underline
 
-    def __init__(self, *args, flags = 0):
+    def __init__(self,
+                 *args,
+                 flags = 0,
+                 cache = None,
+                 profile = False,
+                 diagnostics = None,
+                 limits = None,
+                 coalesce = False):
 
         for cls in self.__class__.__mro__:
             if not issubclass(cls, Base):
                 continue
             flags |= cls.flags
 
-        self._client = clients.Main(
+        options = {
+            'flags'      : flags,
+            'profile'    : profile,
+            'diagnostics': diagnostics,
+            'limits'     : limits,
+            'coalesce'   : coalesce
+        }
+
+        if profile or diagnostics or limits:
+            self._client = self._connect(*args, **options)
+        else:
+            key = (self.__class__, args, int(flags), coalesce)
+            try:
+                self._client = self._clients[key]
+            except KeyError:
+                client = self._connect(*args, **options)
+                self._client = self._clients.setdefault(key, client)
+
+        self._cache = cache
+
+        self._args = args
+
+        # options changing results, which key them in caches
+        self._options = {'flags': int(flags), 'coalesce': coalesce}
+
+    @classmethod
+    def _connect(cls, *args, **options):
+
+        # without leave handlers, leaving skips the dispatch entirely
+        direct = any(any(funcs) for funcs in cls._leavers.values())
+
+        leave = cls._exit if direct else cls._leave
+
+        return clients.Main(
             *args,
-            flags = flags,
-            enter_block = self._enter,
-            leave_block = self._leave,
-            enter_span = self._enter,
-            leave_span = self._leave,
-            text = self._track
+            **options,
+            unpack = True,
+            interest = cls._interest,
+            details = ('enter_block', 'enter_span'),
+            enter_block = cls._enter,
+            leave_block = leave,
+            enter_span = cls._enter,
+            leave_span = leave,
+            text = cls._track
         )
 
     @property
@@ -48,62 +149,413 @@ class Base(abc.ABC):
 
         return self._client
 
+    @property
+    def cache(self):
+
+        return self._cache
+
+    def _decode(self, attribute):
+
+        return details.decode(attribute, self._client.encoding)
+
+    def __init_subclass__(cls, **kwargs):
+
+        super().__init_subclass__(**kwargs)
+
+        cls._handlers = {
+            enum: tuple(
+                getattr(cls, f'_parse_{cls._res(type)}', None) for type in enum
+            )
+            for enum in (enums.Block, enums.Span)
+        }
+
+        cls._leavers = {
+            enum: tuple(
+                getattr(cls, f'_leave_{cls._res(type)}', None) for type in enum
+            )
+            for enum in (enums.Block, enums.Span)
+        }
+
+        # types reaching each clause, used by parses and replays alike
+        cls._interest = {}
+
+        if cls._enter is not Base._enter:
+            return
+
+        for (names, enum) in ((('enter_block', 'leave_block'), enums.Block),
+                              (('enter_span' , 'leave_span' ), enums.Span )):
+            (enter, leave) = (
+                frozenset(type for (type, func) in zip(enum, funcs) if func)
+                for funcs in (cls._handlers[enum], cls._leavers[enum])
+            )
+            cls._interest[names[0]] = enter
+            cls._interest[names[1]] = enter | leave
+
     @staticmethod
     def _res(type):
 
         return type.name.rstrip('_')
 
-    def _enter(self, type, info):
+    def _enter(self, state, type, info):
+
+        func = self._handlers[type.__class__][type]
 
-        name = self._res(type)
+        if not func:
+            return
 
-        name = f'_parse_{name}'
+        func(self, state, info)
 
-        func = getattr(self, name, None)
+    def _exit(self, state, type, info):
+
+        func = self._leavers[type.__class__][type]
 
         if not func:
+            self._leave(state, type, info)
             return
 
-        func(info)
+        func(self, state, type, info)
+
+    def _start(self):
+
+        """
+        Should return the state for a single parse.
+        """
+
+        return self._State()
 
     @abc.abstractmethod
-    def _track(self, type, data):
+    def _track(self, state, type, data):
 
         """
         Simple text will be directed here.
         """
 
     @abc.abstractmethod
-    def _leave(self, type, info):
+    def _leave(self, state, type, info):
 
         """
         Exiting tags will triger this.
         """
 
     @abc.abstractmethod
-    def _get(self):
+    def _get(self, state):
 
         """
         Should return the final result.
         """
 
-    def get(self, value):
+    def _stream(self, state, into):
+
+        """
+        Can make ``state`` write finished parts of the result to ``into``.
+        """
+
+    def _binary(self, state):
+
+        """
+        Can make ``state`` produce bytes, returning whether it will.
+        """
+
+        return False
+
+    def _render(self, parse, value, into, binary = False):
+
+        state = self._start()
+
+        encode = binary and not self._binary(state)
+
+        if into is not None:
+            if encode:
+                into = _Encoder(into, self._client.encoding)
+            self._stream(state, into)
+
+        parse(value, (self, state))
+
+        value = self._get(state)
+
+        if into is None:
+            return value.encode(self._client.encoding) if encode else value
+
+        if value:
+            into.write(value)
+
+    def _key(self, data, binary):
+
+        digest = hashlib.blake2b(data, digest_size = 20).digest()
+
+        cls = self.__class__
+
+        return (
+            digest,
+            f'{cls.__module__}.{cls.__qualname__}',
+            self._client.encoding,
+            binary,
+            *self._options.items()
+        )
+
+    def get(self, value, into = None):
 
         """
         Parse the value and get the result.
+
+        If ``value`` is bytes-like, so is the result.
+
+        If ``into`` is a file object, the result is written to it instead.
+        Parsers that support it write each finished top-level block as soon as
+        it is available, as bytes if ``value`` is bytes-like.
         """
 
-        self._client.parse(value)
+        binary = not isinstance(value, str)
+
+        if self._cache is None:
+            return self._render(self._client.parse, value, into, binary)
+
+        if not binary:
+            value = value.encode(self._client.encoding)
+
+        key = self._key(value, binary)
+
+        result = self._cache.get(key)
+
+        if result is None:
+            result = self._render(self._client.parse, value, None, binary)
+            self._cache.set(key, result)
+
+        if into is None:
+            return result
+
+        into.write(result)
+
+    async def aget(self, value, pool = None, timeout = None):
+
+        """
+        Like :meth:`get`, but in ``pool``, a :class:`~.tasks.Pool`, without
+        blocking the event loop.
+
+        Cancelling, or waiting for longer than ``timeout`` seconds, aborts the
+        parse when it runs in a thread. Processes create their own parser of
+        the same class and options, and results are cached here.
+        """
+
+        from . import tasks
+
+        pool = pool or tasks.pool()
+
+        if not pool.processes:
+            return await pool.run(self.get, value, timeout = timeout)
 
-        value = self._get()
+        client = self._client
+
+        if client.profile or client.diagnostics:
+            raise TypeError('cannot profile or diagnose other processes')
+
+        key = None
+
+        if self._cache is not None:
+            binary = not isinstance(value, str)
+            data = value if binary else value.encode(client.encoding)
+            key = self._key(data, binary)
+            result = self._cache.get(key)
+            if result is not None:
+                return result
+
+        args = (self.__class__, self._args, self._options, client.limits, value)
+
+        result = await pool.run(tasks.get, *args, timeout = timeout)
+
+        if key:
+            self._cache.set(key, result)
+
+        return result
+
+    def get_file(self, file, into = None):
+
+        """
+        Like :meth:`get`, but for :meth:`~.clients.Main.parse_file`.
+        """
+
+        return self._render(self._client.parse_file, file, into)
+
+    def get_stream(self, chunks, into = None):
+
+        """
+        Like :meth:`get`, but for :meth:`~.clients.Main.parse_stream`.
+        """
+
+        return self._render(self._client.parse_stream, chunks, into)
+
+    @classmethod
+    def map(cls, values, *args, **options):
+
+        """
+        Lazily get the results of parsing ``values`` across processes.
+
+        Each process creates its own parser with ``args`` and ``options``.
+        See :func:`~.pools.map` for the batching options.
+
+        .. note::
+
+            Like any process pool, this should be called under an
+            ``if __name__ == '__main__'`` guard.
+        """
+
+        from . import pools
+
+        return pools.map(cls, values, *args, **options)
+
+    def replay(self, buffer):
+
+        """
+        Get the result from an :class:`~.events.Buffer` or
+        :class:`~.events.Stream` without parsing.
+
+        Like :meth:`get`, tags without handlers are skipped.
+        """
+
+        interest = self._interest
+
+        clauses = (
+            (enums.Block, self._enter, interest.get('enter_block')),
+            (enums.Block, self._exit , interest.get('leave_block')),
+            (enums.Span , self._enter, interest.get('enter_span' )),
+            (enums.Span , self._exit , interest.get('leave_span' ))
+        )
+
+        text = enums.Event.text
+
+        get = buffer.get
+
+        state = self._start()
+
+        for (kind, type, offset, size, detail) in buffer:
+            if kind == text:
+                value = get(offset, size, detail)
+                self._track(state, enums.Text(type), bytes(value))
+                continue
+            (enum, func, only) = clauses[kind]
+            type = enum(type)
+            if not (only is None or type in only):
+                continue
+            func(state, type, get(offset, size, detail))
+
+        value = self._get(state)
 
         return value
 
 
-try:
-    import bs4
-except ImportError:
-    bs4 = None
+class Tree(Base):
+
+    """
+    Builds a tree of :class:`~.nodes.Node` and :class:`~.nodes.Text`.
+
+    Details are copied into plain values once, so the tree remains valid
+    after parsing and can be shared by any number of consumers. Source
+    offsets are only known for :meth:`get` and :meth:`replay`.
+    """
+
+    __slots__ = ()
+
+    class _State:
+
+        __slots__ = ('root', 'nodes')
+
+        def __init__(self):
+
+            self.root = None
+
+            self.nodes = []
+
+    def _open(self, state, type, detail, offset):
+
+        node = nodes.Node(type, detail)
+
+        if state.nodes:
+            state.nodes[-1].children.append(node)
+        else:
+            state.root = node
+
+        state.nodes.append(node)
+
+    def _text(self, state, type, data, offset):
+
+        data = data.decode(self._client.encoding)
+
+        node = nodes.Text(type, data, offset)
+
+        state.nodes[-1].children.append(node)
+
+        if offset is None:
+            return
+
+        for node in reversed(state.nodes):
+            if node.start is not None:
+                break
+            node.start = offset
+
+    def _close(self, state, offset):
+
+        node = state.nodes.pop()
+
+        if node.start is not None:
+            node.end = offset
+
+    def _enter(self, state, type, info):
+
+        self._open(state, type, info.detach() if info else None, None)
+
+    def _track(self, state, type, data):
+
+        self._text(state, type, data, None)
+
+    def _leave(self, state, type, info):
+
+        self._close(state, None)
+
+    def _get(self, state):
+
+        return state.root
+
+    def get(self, value):
+
+        """
+        Parse the value and get the root node.
+        """
+
+        buffer = self._client.record(value)
+
+        return self.replay(buffer)
+
+    def replay(self, buffer):
+
+        clauses = (enums.Block, None, enums.Span, None)
+
+        text = enums.Event.text
+
+        get = buffer.get
+
+        state = self._start()
+
+        for (kind, type, offset, size, detail) in buffer:
+            value = get(offset, size, detail)
+            if kind == text:
+                offset = None if detail else offset
+                self._text(state, enums.Text(type), bytes(value), offset)
+                continue
+            enum = clauses[kind]
+            if enum is None:
+                self._close(state, offset)
+                continue
+            self._open(state, enum(type), value, offset)
+
+        return self._get(state)
+
+
+# imported by the first parser needing it
+bs4 = None
+
+
+# attributes of table cells, by alignment
+_aligns = tuple({'align': align.name} if align else {} for align in enums.Align)
 
 
 class Html(Base):
@@ -122,218 +574,578 @@ class Html(Base):
 
     flags = flags.Spec.tables
 
-    __slots__ = ('_tags', '_soup')
+    __slots__ = ()
 
-    def __init__(self, *args, **opts):
+    class _State:
 
-        if not bs4:
-            raise ImportError('mising "bs4" module')
+        __slots__ = ('soup', 'tags')
 
-        super().__init__(*args, **opts)
+        def __init__(self):
+
+            self.soup = bs4.BeautifulSoup(features = 'html.parser')
+
+            self.tags = [self.soup]
 
-        soup = bs4.BeautifulSoup(features = 'html.parser')
+    def __init__(self, *args, **opts):
+
+        global bs4
 
-        self._tags = (self._soup,) = [soup]
+        if not bs4:
+            bs4 = _require('bs4')
 
-    def _get(self):
+        super().__init__(*args, **opts)
 
-        data = str(self._soup)
+    def _get(self, state):
 
-        self._soup.clear()
+        data = str(state.soup)
 
         return data
 
-    def _add(self, data):
+    def _add(self, state, data):
 
-        self._tags[-1].append(data)
+        state.tags[-1].append(data)
 
-    def _track(self, type, data):
+    def _track(self, state, type, data):
 
         data = data.decode(self._client.encoding)
 
-        self._add(data)
+        self._add(state, data)
 
-    def _fin(self):
+    def _fin(self, state):
 
-        data = self._tags.pop()
+        data = state.tags.pop()
 
-        self._add(data)
+        self._add(state, data)
 
-    def _leave(self, type, info):
+    def _leave(self, state, type, info):
 
-        self._fin()
+        if type is enums.Block.code:
+            self._fin(state)
 
-    def _new(self, name, info = {}):
+        self._fin(state)
 
-        value = self._soup.new_tag(name, **info)
+    def _new(self, state, name, info = {}):
 
-        self._tags.append(value)
+        value = state.soup.new_tag(name, **info)
+
+        state.tags.append(value)
 
         return value
 
-    def _parse_doc(self, info):
+    def _parse_doc(self, state, info):
 
         name = 'body'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_quote(self, info):
+    def _parse_quote(self, state, info):
 
         name = 'blockquote'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_ul(self, info):
+    def _parse_ul(self, state, info):
 
         name = 'ul'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_ol(self, info):
+    def _parse_ol(self, state, info):
 
         name = 'ol'
 
         attrs = {'start': info.start}
 
-        self._new(name, info = attrs)
+        self._new(state, name, info = attrs)
 
-    def _parse_li(self, info):
+    def _parse_li(self, state, info):
 
         name = 'li'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_hr(self, info):
+    def _parse_hr(self, state, info):
 
         name = 'hr'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_h(self, info):
+    def _parse_h(self, state, info):
 
         name = f'h{info.level}'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _b_parse_code(self, info):
+    def _b_parse_code(self, state, info):
 
         name = 'pre'
 
-        self._new(name)
+        self._new(state, name)
 
         attrs = {}
 
-        if info.lang:
-            text = info.lang.text.decode(self._client.encoding)
+        text = self._decode(info.lang)
+
+        if text:
             attrs['class'] = f'language-{text}'
 
         name = 'code'
 
-        self._new(name, info = attrs)
-
-        self._fin()
+        self._new(state, name, info = attrs)
 
-    def _s_parse_code(self, info):
+    def _s_parse_code(self, state, info):
 
         name = 'code'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_code(self, info):
+    def _parse_code(self, state, info):
 
-        (self._b_parse_code if info else self._s_parse_code)(info)
+        (self._b_parse_code if info else self._s_parse_code)(state, info)
 
-    def _parse_html(self, info):
+    def _parse_html(self, state, info):
 
-        self._add(info)
+        self._add(state, info)
 
-    def _parse_p(self, info):
+    def _parse_p(self, state, info):
 
         name = 'p'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_table(self, info):
+    def _parse_table(self, state, info):
 
         name = 'table'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_tbody(self, info):
+    def _parse_thead(self, state, info):
+
+        name = 'thead'
+
+        self._new(state, name)
+
+    def _parse_tbody(self, state, info):
 
         name = 'tbody'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_tr(self, info):
+    def _parse_tr(self, state, info):
 
         name = 'tr'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_th(self, info):
+    def _parse_th(self, state, info):
 
         name = 'th'
 
-        self._new(name)
+        self._new(state, name, _aligns[info.align])
 
-    def _parse_td(self, info):
+    def _parse_td(self, state, info):
 
         name = 'td'
 
-        self._new(name)
+        self._new(state, name, _aligns[info.align])
 
-    def _parse_em(self, info):
+    def _parse_em(self, state, info):
 
         name = 'em'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_strong(self, info):
+    def _parse_strong(self, state, info):
 
         name = 'strong'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_a(self, info):
+    def _parse_a(self, state, info):
 
         attrs = {}
 
         if info:
-            text = info.href.text.decode(self._client.encoding)
+            text = self._decode(info.href)
             attrs['href'] = text
 
         name = 'a'
 
-        self._new(name, info = attrs)
+        self._new(state, name, info = attrs)
 
-    def _parse_img(self, info):
+    def _parse_img(self, state, info):
 
-        text = info.src.text.decode(self._client.encoding)
+        text = self._decode(info.src)
 
         attrs = {'src': text}
 
         name = 'img'
 
-        self._new(name, info = attrs)
+        self._new(state, name, info = attrs)
 
-    def _parse_del(self, info):
+    def _parse_del(self, state, info):
 
         name = 'del'
 
-        self._new(name)
+        self._new(state, name)
 
-    def _parse_u(self, info):
+    def _parse_u(self, state, info):
 
         name = 'u'
 
-        self._new(name)
+        self._new(state, name)
+
+
+@functools.lru_cache(maxsize = 256)
+def _encode(data, encoding):
+
+    return data.encode(encoding)
+
+
+def _cells(name):
+
+    for attrs in _aligns:
+        attrs = ''.join(f' {key}="{value}"' for (key, value) in attrs.items())
+        yield (f'<{name}{attrs}>', f'</{name}>')
+
+
+class Markup(Base):
+
+    """
+    Converts to html by writing tags directly, without dependencies.
+
+    Produces the same markup as :class:`Html`, except that:
+
+    - entities and raw html are kept as written, where :class:`Html` escapes
+      them;
+    - hard breaks are ``<br/>`` tags, where :class:`Html` only keeps their
+      text;
+    - links and images carry their ``title``;
+    - images carry their text as ``alt``, where :class:`Html` nests it;
+    - math and wiki links become ``x-equation`` and ``x-wikilink`` tags, like
+      md4c's own renderer, where :class:`Html` only keeps their text.
+
+    Supports writing each top-level block as soon as it is finished, rows of
+    large tables in bulk, and producing bytes without decoding text, for
+    ascii-compatible encodings. Table cells carry their ``align``.
+
+    Flags: ``tables``.
+    """
+
+    flags = flags.Spec.tables
+
+    __slots__ = ()
+
+    class _State:
+
+        __slots__ = ('buffer', 'closes', 'alt', 'into', 'binary', 'empty')
+
+        def __init__(self):
+
+            self.buffer = []
+
+            self.closes = []
+
+            self.alt = None
+
+            self.into = None
+
+            self.binary = False
+
+            self.empty = ''
+
+    _texts = {
+        enums.Text.nullchar: '\ufffd',
+        enums.Text.br      : '<br/>\n',
+        enums.Text.soft_br : '\n'
+    }
+
+    _raw = frozenset((enums.Text.entity, enums.Text.html))
+
+    # rows are written to into once this many fragments are buffered
+    _bulk = 4096
+
+    _tr = ('<tr>', '</tr>')
 
+    _th = tuple(_cells('th'))
 
-try:
-    import sty
-except ImportError:
-    sty = None
+    _td = tuple(_cells('td'))
+
+    _escapes = ((b'&', b'&amp;'), (b'<', b'&lt;'), (b'>', b'&gt;'))
+
+    def _get(self, state):
+
+        data = state.empty.join(state.buffer)
+
+        return data
+
+    def _add(self, state, data):
+
+        state.buffer.append(data)
+
+    def _binary(self, state):
+
+        state.binary = True
+
+        state.empty = b''
+
+        return True
+
+    def _encode(self, data):
+
+        return _encode(data, self._client.encoding)
+
+    def _track(self, state, type, data):
+
+        if type in self._texts:
+            data = self._texts[type]
+            if state.binary:
+                data = self._encode(data)
+        elif state.binary:
+            if type not in self._raw:
+                for (old, new) in self._escapes:
+                    data = data.replace(old, new)
+        else:
+            data = data.decode(self._client.encoding)
+            if type not in self._raw:
+                data = html.escape(data, False)
+
+        if state.alt is None:
+            self._add(state, data)
+        else:
+            state.alt.append(data)
+
+    def _fin(self, state):
+
+        data = state.closes.pop()
+
+        self._add(state, data)
+
+    def _stream(self, state, into):
+
+        state.into = into
+
+    def _flush(self, state):
+
+        data = state.empty.join(state.buffer)
+
+        state.buffer.clear()
+
+        state.into.write(data)
+
+    def _leave(self, state, type, info):
+
+        if state.alt is None or state.closes[-1].__class__ is not dict:
+            self._fin(state)
+            if state.into and len(state.closes) == 1:
+                self._flush(state)
+            return
+
+        attrs = state.closes.pop()
+
+        (alt, state.alt) = (state.empty.join(state.alt), None)
+
+        if isinstance(alt, bytes):
+            alt = alt.decode(self._client.encoding)
+
+        attrs['alt'] = html.unescape(alt)
+
+        self._new(state, 'img', info = attrs, close = False)
+
+        state.closes.pop()
+
+    def _leave_tr(self, state, type, info):
+
+        self._fin(state)
+
+        if state.into and len(state.buffer) > self._bulk:
+            self._flush(state)
+
+    def _tag(self, state, open, close):
+
+        if state.binary:
+            open = self._encode(open)
+            close = self._encode(close)
+
+        state.buffer.append(open)
+
+        state.closes.append(close)
+
+    def _new(self, state, name, info = None, close = True):
+
+        if state.alt is not None:
+            state.closes.append(state.empty)
+            return
+
+        attrs = ''
+
+        if info:
+            attrs = ''.join(
+                f' {key}="{html.escape(value)}"' for (key, value) in info.items()
+            )
+
+        if close:
+            open = f'<{name}{attrs}>'
+            close = f'</{name}>'
+        else:
+            open = f'<{name}{attrs}/>'
+            close = ''
+
+        if state.binary:
+            open = self._encode(open)
+            close = self._encode(close)
+
+        self._add(state, open)
+
+        state.closes.append(close)
+
+    def _parse_doc(self, state, info):
+
+        self._new(state, 'body')
+
+    def _parse_quote(self, state, info):
+
+        self._new(state, 'blockquote')
+
+    def _parse_ul(self, state, info):
+
+        self._new(state, 'ul')
+
+    def _parse_ol(self, state, info):
+
+        attrs = {'start': str(info.start)}
+
+        self._new(state, 'ol', info = attrs)
+
+    def _parse_li(self, state, info):
+
+        self._new(state, 'li')
+
+    def _parse_hr(self, state, info):
+
+        self._new(state, 'hr', close = False)
+
+    def _parse_h(self, state, info):
+
+        self._new(state, f'h{info.level}')
+
+    def _parse_code(self, state, info):
+
+        if not info:
+            self._new(state, 'code')
+            return
+
+        attrs = {}
+
+        text = self._decode(info.lang)
+
+        if text:
+            attrs['class'] = f'language-{text}'
+
+        self._new(state, 'pre')
+
+        self._new(state, 'code', info = attrs)
+
+        close = state.closes.pop()
+
+        state.closes[-1] = close + state.closes[-1]
+
+    def _parse_html(self, state, info):
+
+        state.closes.append(state.empty)
+
+    def _parse_p(self, state, info):
+
+        self._new(state, 'p')
+
+    def _parse_table(self, state, info):
+
+        self._new(state, 'table')
+
+    def _parse_thead(self, state, info):
+
+        self._new(state, 'thead')
+
+    def _parse_tbody(self, state, info):
+
+        self._new(state, 'tbody')
+
+    def _parse_tr(self, state, info):
+
+        self._tag(state, *self._tr)
+
+    def _parse_th(self, state, info):
+
+        self._tag(state, *self._th[info.align])
+
+    def _parse_td(self, state, info):
+
+        self._tag(state, *self._td[info.align])
+
+    def _parse_em(self, state, info):
+
+        self._new(state, 'em')
+
+    def _parse_strong(self, state, info):
+
+        self._new(state, 'strong')
+
+    def _parse_a(self, state, info):
+
+        attrs = {}
+
+        if info:
+            attrs['href'] = self._decode(info.href)
+            title = self._decode(info.title)
+            if title:
+                attrs['title'] = title
+
+        self._new(state, 'a', info = attrs)
+
+    def _parse_img(self, state, info):
+
+        if state.alt is not None:
+            state.closes.append(state.empty)
+            return
+
+        attrs = {'src': self._decode(info.src)}
+
+        title = self._decode(info.title)
+
+        if title:
+            attrs['title'] = title
+
+        state.alt = []
+
+        state.closes.append(attrs)
+
+    def _parse_del(self, state, info):
+
+        self._new(state, 'del')
+
+    def _parse_latex_math(self, state, info):
+
+        self._new(state, 'x-equation')
+
+    def _parse_latex_math_display(self, state, info):
+
+        attrs = {'type': 'display'}
+
+        self._new(state, 'x-equation', info = attrs)
+
+    def _parse_wiki_link(self, state, info):
+
+        attrs = {'data-target': self._decode(info.target)}
+
+        self._new(state, 'x-wikilink', info = attrs)
+
+    def _parse_u(self, state, info):
+
+        self._new(state, 'u')
+
+
+# imported by the first parser needing it
+sty = None
 
 
 class Ansi(Base):
@@ -341,6 +1153,9 @@ class Ansi(Base):
     """
     Converts to ansi escape sequences.
 
+    Supports writing to a file object as events arrive, so pagers can show
+    output right away.
+
     Flags: ``no_html``.
 
     .. warning::
@@ -352,114 +1167,151 @@ class Ansi(Base):
 
     flags = flags.Spec.no_html
 
-    __slots__ = ('_buffer', '_closes', '_listing')
+    __slots__ = ()
+
+    class _State:
+
+        __slots__ = ('buffer', 'closes', 'listing', 'width', 'into', 'started')
+
+        def __init__(self):
+
+            self.buffer = []
+
+            self.closes = []
+
+            self.listing = []
+
+            self.width = None
+
+            self.into = None
+
+            self.started = False
 
     def __init__(self, *args, **opts):
 
-        if not sty:
+        global sty
 
-            raise ImportError('missing "sty" module')
+        if not sty:
+            sty = _require('sty')
 
         super().__init__(*args, **opts)
 
-        self._buffer = []
+    def _get(self, state):
 
-        self._closes = []
+        data = ''.join(state.buffer)
 
-        self._listing = []
+        return data.lstrip()
 
-    def _get(self):
+    def _stream(self, state, into):
 
-        zeros = (0,) * len(self._buffer)
+        state.into = into
 
-        data = ''.join(map(self._buffer.pop, zeros))
+    def _add(self, state, data):
 
-        return data.lstrip().lstrip('\n')
+        if state.into is None:
+            state.buffer.append(data)
+            return
 
-    def _add(self, data):
+        if not data:
+            return
+
+        # leading whitespace is stripped, like the whole result otherwise
+        if not state.started:
+            data = data.lstrip()
+            if not data:
+                return
+            state.started = True
 
-        self._buffer.append(data)
+        state.into.write(data)
 
-    def _track(self, type, data):
+    def _track(self, state, type, data):
 
         data = data.decode(self._client.encoding)
 
-        self._add(data)
+        self._add(state, data)
+
+    def _fin(self, state):
 
-    def _fin(self):
+        data = state.closes.pop()
 
-        data = self._closes.pop()
+        self._add(state, data)
 
-        self._add(data)
+    def _leave(self, state, type, info):
 
-    def _leave(self, type, info):
+        self._fin(state)
 
-        self._fin()
+    def _leave_ul(self, state, type, info):
 
-    def _new(self, open, close = None):
+        state.listing.pop()
 
-        self._buffer.append(open)
+        self._fin(state)
+
+    _leave_ol = _leave_ul
+
+    def _new(self, state, open, close = None):
+
+        self._add(state, open)
 
         if close is None:
             return
 
-        self._closes.append(close)
+        state.closes.append(close)
 
-    def _nil(self, close):
+    def _nil(self, state, close):
 
         open = self._empty
 
         close = open if close else None
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_doc(self, info):
+    def _parse_doc(self, state, info):
 
-        self._nil(1)
+        self._nil(state, 1)
 
-    def _parse_quote(self, info):
+    def _parse_quote(self, state, info):
 
         open = sty.ef.inverse
 
         close = sty.rs.inverse
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_ul(self, info):
+    def _parse_ul(self, state, info):
 
-        self._listing.append(info)
+        state.listing.append(info.detach())
 
-        self._nil(1)
+        self._nil(state, 1)
 
-    def _parse_ol(self, info):
+    def _parse_ol(self, state, info):
 
-        self._listing.append(info)
+        state.listing.append(info.detach())
 
-        self._nil(1)
+        self._nil(state, 1)
 
     def _fetch_li_mark_ul(self, info):
 
-        value = info.mark
+        value = info.mark.decode()
 
         return value
 
     def _fetch_li_mark_ol(self, info):
 
-        value = f'{info.start}{mark_delimiter}'
+        value = f'{info.start}{info.mark_delimiter.decode()}'
 
         info.start += 1
 
         return value
 
-    def _parse_li(self, info):
+    def _parse_li(self, state, info):
 
-        level = len(self._listing) - 1
+        level = len(state.listing) - 1
 
         next = ' '
 
         push = next * 2 * level
 
-        l_info = self._listing[level]
+        l_info = state.listing[level]
 
         name = l_info.__class__.__name__.lower()
 
@@ -467,78 +1319,253 @@ class Ansi(Base):
 
         mark = getattr(self, name)(l_info)
 
-        mark = '-'
-
         open = f'\n{push}{mark}{next}'
 
         close = self._empty
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_hr(self, info):
+    def _parse_hr(self, state, info):
 
-        (width, height) = shutil.get_terminal_size()
+        if state.width is None:
+            state.width = shutil.get_terminal_size().columns
 
-        open = width * '-'
+        open = state.width * '-'
 
-        self._new(open)
+        self._new(state, open, self._empty)
 
-    def _parse_h(self, info):
+    def _parse_h(self, state, info):
 
         open = '\n# '
 
         close = ' #\n'
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_code(self, info):
+    def _parse_code(self, state, info):
 
         open = sty.ef.inverse
 
         close = sty.rs.inverse
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_p(self, info):
+    def _parse_p(self, state, info):
 
-        self._nil(1)
+        self._nil(state, 1)
 
-    def _parse_em(self, info):
+    def _parse_em(self, state, info):
 
         open = sty.ef.italic
 
         close = sty.rs.italic
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_strong(self, info):
+    def _parse_strong(self, state, info):
 
         open = sty.ef.bold
 
         close = sty.rs.bold_dim
 
-        self._new(open, close)
+        self._new(state, open, close)
 
-    def _parse_a(self, info):
+    def _parse_a(self, state, info):
 
-        self._nil(1)
+        self._nil(state, 1)
 
-    def _parse_img(self, info):
+    def _parse_img(self, state, info):
 
-        text = info.src.text.decode(self._client.encoding)
+        text = self._decode(info.src)
 
         open = f'\n{text}\n'
 
-        self._new(open)
+        self._new(state, open, self._empty)
 
-    def _parse_del(self, info):
+    def _parse_del(self, state, info):
 
         open = sty.ef.strike
 
         close = sty.rs.strike
 
-        self._new(open, close)
+        self._new(state, open, close)
+
+    def _parse_u(self, state, info):
+
+        self._new(state, sty.ef.underl, sty.rs.underl)
+
+
+class Tables(Base):
+
+    """
+    Extracts the text of table cells, rendering nothing else.
+
+    Produces ``csv`` rows, every table starting with its head and separated
+    from the next by an empty line, or ``json`` lines of one record per body
+    row, keyed by the cells of its head. With ``into``, a text file, each row
+    is written as soon as it is finished. :meth:`extract` gets tables as
+    lists of rows instead.
+
+    Flags: ``tables``.
+    """
+
+    flags = flags.Spec.tables
+
+    __slots__ = ('_format',)
+
+    class _State:
+
+        __slots__ = (
+            'tables', 'head', 'row', 'column', 'cell', 'count', 'out',
+            'into', 'writer'
+        )
+
+        def __init__(self):
+
+            self.tables = None
+
+            self.head = None
+
+            self.row = None
+
+            self.column = 0
+
+            self.cell = None
+
+            self.count = 0
+
+            self.out = io.StringIO()
+
+            self.into = False
+
+            self.writer = None
+
+    _formats = ('csv', 'json')
+
+    _texts = {
+        enums.Text.nullchar: '\ufffd',
+        enums.Text.br      : '\n',
+        enums.Text.soft_br : ' '
+    }
+
+    def __init__(self, *args, format = 'csv', **opts):
+
+        if format not in self._formats:
+            raise ValueError(f'unknown format "{format}"')
+
+        super().__init__(*args, **opts)
+
+        self._format = format
+
+        self._options['format'] = format
+
+    def extract(self, value):
+
+        """
+        Get the tables of ``value``, each a list of rows of cell text, its
+        head first.
+        """
+
+        state = self._start()
+
+        state.tables = []
+
+        self._client.parse(value, (self, state))
+
+        return state.tables
+
+    def _get(self, state):
+
+        return '' if state.into else state.out.getvalue()
+
+    def _stream(self, state, into):
+
+        state.out = into
+
+        state.into = True
+
+    def _track(self, state, type, data):
+
+        if state.cell is None:
+            return
+
+        if type in self._texts:
+            data = self._texts[type]
+        else:
+            data = data.decode(self._client.encoding)
+            if type is enums.Text.entity:
+                data = html.unescape(data)
+
+        state.cell.append(data)
+
+    def _write(self, state, row):
+
+        if state.tables is not None:
+            state.tables[-1].append(row)
+            return
+
+        if self._format == 'json':
+            if row is not state.head:
+                record = dict(zip(state.head, row))
+                state.out.write(json.dumps(record, ensure_ascii = False) + '\n')
+            return
+
+        if not state.writer:
+            state.writer = csv.writer(state.out, lineterminator = '\n')
+
+        state.writer.writerow(row)
+
+    def _leave(self, state, type, info):
+
+        # only rows and cells produce anything
+        pass
+
+    def _leave_tr(self, state, type, info):
+
+        if state.head is None:
+            state.head = state.row
+
+        self._write(state, state.row)
+
+        state.row = None
+
+    def _leave_th(self, state, type, info):
+
+        value = ''.join(state.cell)
+
+        state.cell = None
+
+        if state.head is None:
+            state.row.append(value)
+        elif state.column < len(state.row):
+            state.row[state.column] = value
+
+        state.column += 1
+
+    _leave_td = _leave_th
+
+    def _parse_table(self, state, info):
+
+        state.head = None
+
+        if state.tables is not None:
+            state.tables.append([])
+        elif state.count and self._format == 'csv':
+            state.out.write('\n')
+
+        state.count += 1
+
+    def _parse_tr(self, state, info):
+
+        # body rows are as wide as the head
+        state.row = [] if state.head is None else [''] * len(state.head)
+
+        state.column = 0
+
+    def _parse_th(self, state, info):
+
+        state.cell = []
 
-    def _parse_u(self, info):
+    def _parse_td(self, state, info):
 
-        self._new(sty.ef.underl, sty.rs.underl)
+        state.cell = []
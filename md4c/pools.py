@@ -0,0 +1,91 @@
+import itertools
+import concurrent.futures
+
+from . import clients
+
+
+__all__ = ()
+
+
+_parser = None
+
+
+def _setup(path, cls, args, options):
+
+    global _parser
+
+    clients.load(path)
+
+    _parser = cls(*args, **options)
+
+
+def _work(values, capture):
+
+    results = []
+
+    for value in values:
+        try:
+            result = _parser.get(value)
+        except Exception as error:
+            if not capture:
+                raise
+            result = error
+        results.append(result)
+
+    return results
+
+
+def _chunk(values, size):
+
+    values = iter(values)
+
+    while True:
+        chunk = tuple(itertools.islice(values, size))
+        if not chunk:
+            break
+        yield chunk
+
+
+def map(cls, values, *args, workers = None, chunksize = 16, ordered = True,
+        capture = False, **options):
+
+    """
+    Get the results of parsing ``values`` across processes.
+
+    :param type cls:
+        The parser class, created once per worker with ``args`` and
+        ``options``.
+    :param int workers:
+        The amount of processes, defaulting to the cpu count.
+    :param int chunksize:
+        The amount of values sent to a worker at once.
+    :param bool ordered:
+        Whether to yield results in order. Otherwise, ``(index, result)``
+        pairs are yielded as soon as they are ready.
+    :param bool capture:
+        Whether to yield exceptions in place of results instead of raising.
+    """
+
+    path = getattr(clients.lib, '_name', None)
+
+    initargs = (path, cls, args, options)
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers = workers,
+            initializer = _setup,
+            initargs = initargs) as executor:
+        chunks = _chunk(values, chunksize)
+        if ordered:
+            results = executor.map(_work, chunks, itertools.repeat(capture))
+            for chunk in results:
+                yield from chunk
+            return
+        futures = {}
+        start = 0
+        for chunk in chunks:
+            future = executor.submit(_work, chunk, capture)
+            futures[future] = start
+            start += len(chunk)
+        for future in concurrent.futures.as_completed(futures):
+            start = futures.pop(future)
+            yield from enumerate(future.result(), start)
@@ -0,0 +1,176 @@
+import json
+import time
+import contextlib
+import collections
+
+from . import enums
+
+
+__all__ = ('Stats', 'Profiler')
+
+
+_clock = time.perf_counter
+
+
+_enums = (enums.Block, enums.Span, enums.Text)
+
+
+def _name(member):
+
+    return member.name.rstrip('_')
+
+
+class Stats:
+
+    """
+    Counters and timings of one parse.
+
+    ``counts`` maps :class:`~.enums.Block`, :class:`~.enums.Span` and
+    :class:`~.enums.Text` to counters of the events the library emitted for
+    each of their types, entering and leaving alike. ``handlers`` maps
+    ``(callback name, type)`` to seconds spent in the python callback, such as
+    a parser's ``_parse_(tag)`` handler.
+    """
+
+    __slots__ = ('counts', 'handlers', 'callbacks', 'total')
+
+    def __init__(self):
+
+        self.counts = {enum: collections.Counter() for enum in _enums}
+
+        self.handlers = collections.Counter()
+
+        self.callbacks = self.total = 0.0
+
+    @property
+    def python(self):
+
+        """
+        Seconds spent in the python callbacks.
+        """
+
+        return sum(self.handlers.values())
+
+    @property
+    def bindings(self):
+
+        """
+        Seconds spent converting events between the library and callbacks.
+        """
+
+        return max(self.callbacks - self.python, 0.0)
+
+    @property
+    def native(self):
+
+        """
+        Seconds spent in the library itself, including crossing into python.
+        """
+
+        return max(self.total - self.callbacks, 0.0)
+
+    def as_dict(self):
+
+        counts = {
+            f'{enum.__name__.lower()}.{_name(type)}': count
+            for (enum, counter) in self.counts.items()
+            for (type, count) in counter.items()
+        }
+
+        handlers = {
+            f'{name}.{_name(type)}': seconds
+            for ((name, type), seconds) in self.handlers.items()
+        }
+
+        return {
+            'total'   : self.total,
+            'native'  : self.native,
+            'bindings': self.bindings,
+            'python'  : self.python,
+            'counts'  : counts,
+            'handlers': handlers
+        }
+
+    def as_json(self, **options):
+
+        return json.dumps(self.as_dict(), **options)
+
+    def __repr__(self):
+
+        values = ', '.join(
+            f'{key}={self.as_dict()[key]:.6f}'
+            for key in ('total', 'native', 'bindings', 'python')
+        )
+
+        return f'{self.__class__.__name__}({values})'
+
+
+_callbacks = {
+    'enter_block': enums.Block,
+    'leave_block': enums.Block,
+    'enter_span' : enums.Span,
+    'leave_span' : enums.Span,
+    'text'       : enums.Text
+}
+
+
+class Profiler:
+
+    """
+    Wraps callbacks to fill a fresh :class:`Stats` on every parse.
+    """
+
+    __slots__ = ('stats',)
+
+    def __init__(self):
+
+        self.stats = None
+
+    @contextlib.contextmanager
+    def start(self):
+
+        self.stats = stats = Stats()
+
+        start = _clock()
+
+        try:
+            yield stats
+        finally:
+            stats.total += _clock() - start
+
+    def handler(self, name, func):
+
+        """
+        Time ``func``, a python callback, under ``name`` and its type.
+        """
+
+        # the type comes right before the detail or data
+        def wrapper(*args):
+            start = _clock()
+            try:
+                return func(*args)
+            finally:
+                self.stats.handlers[name, args[-2]] += _clock() - start
+
+        return wrapper
+
+    def trampoline(self, name, func):
+
+        """
+        Time ``func``, as called by the library, and count its events.
+        """
+
+        enum = _callbacks[name]
+
+        members = tuple(enum)
+
+        def wrapper(type, *args):
+            start = _clock()
+            try:
+                return func(type, *args)
+            finally:
+                stats = self.stats
+                stats.callbacks += _clock() - start
+                stats.counts[enum][members[type]] += 1
+
+        return wrapper
@@ -17,7 +17,7 @@ clause = ctypes.CFUNCTYPE(
 text = ctypes.CFUNCTYPE(
     types.ires,
     types.enum,
-    types.char_p,
+    types.void,
     types.size,
     types.void
 )
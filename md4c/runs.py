@@ -0,0 +1,144 @@
+import html
+import ctypes
+
+from . import enums
+
+
+__all__ = ('Coalescer',)
+
+
+_normal = enums.Text.normal
+
+
+_soft_br = enums.Text.soft_br
+
+
+_entity = enums.Text.entity
+
+
+_types = frozenset(map(int, (_normal, _soft_br, _entity)))
+
+
+class _Run:
+
+    __slots__ = ('parts', 'address', 'size', 'target')
+
+    def __init__(self):
+
+        self.parts = []
+
+        self.address = None
+
+        self.size = 0
+
+        self.target = None
+
+    def cut(self):
+
+        if self.address is None:
+            return
+
+        self.parts.append(ctypes.string_at(self.address, self.size))
+
+        self.address = None
+
+    def add(self, type, data, size, encoding):
+
+        if type == _normal:
+            if self.address is not None and data == self.address + self.size:
+                self.size += size
+                return
+            self.cut()
+            (self.address, self.size) = (data, size)
+            return
+
+        self.cut()
+
+        if type == _soft_br:
+            self.parts.append(b'\n')
+            return
+
+        value = ctypes.string_at(data, size).decode('ascii', 'replace')
+
+        self.parts.append(html.unescape(value).encode(encoding))
+
+
+class Coalescer:
+
+    """
+    Merges adjacent ``normal``, ``soft_br`` and ``entity`` text into one
+    ``normal`` text event, with entities resolved.
+
+    Contiguous source text is handed over as it is; anything else is joined
+    once per run. Runs end before the next other event and with the parse.
+    """
+
+    __slots__ = ('_encoding', '_runs')
+
+    def __init__(self, encoding):
+
+        self._encoding = encoding
+
+        self._runs = {}
+
+    def start(self, key):
+
+        self._runs[key] = _Run()
+
+    def stop(self, key):
+
+        del self._runs[key]
+
+    def flush(self, key):
+
+        """
+        Hand the pending run of ``key`` over, getting its callback's result.
+        """
+
+        run = self._runs[key]
+
+        if run.target is None:
+            return 0
+
+        target = run.target
+
+        run.target = None
+
+        if not run.parts:
+            (address, size, run.address) = (run.address, run.size, None)
+            return target(_normal, address, size, key)
+
+        run.cut()
+
+        data = b''.join(run.parts)
+
+        run.parts.clear()
+
+        address = ctypes.cast(data, ctypes.c_void_p).value
+
+        return target(_normal, address, len(data), key)
+
+    def trampoline(self, name, func):
+
+        """
+        Collect text for ``func``, or end the run before calling it.
+        """
+
+        runs = self._runs
+
+        flush = self.flush
+
+        if name == 'text':
+            encoding = self._encoding
+            def wrapper(type, data, size, udata):
+                if type not in _types:
+                    return flush(udata) or func(type, data, size, udata)
+                run = runs[udata]
+                run.target = func
+                run.add(type, data, size, encoding)
+                return 0
+        else:
+            def wrapper(type, detail, udata):
+                return flush(udata) or func(type, detail, udata)
+
+        return wrapper
@@ -0,0 +1,227 @@
+import os
+import asyncio
+import weakref
+import concurrent.futures
+
+from . import wraps
+
+
+__all__ = ('Token', 'Pool', 'pool')
+
+
+class Token:
+
+    """
+    Lets a coroutine abort the parse running for it in another thread.
+    """
+
+    __slots__ = ('key', 'error')
+
+    def __init__(self):
+
+        self.key = None
+
+        self.error = None
+
+    def attach(self, key):
+
+        self.key = key
+
+        if self.error:
+            wraps.abort(key, self.error)
+
+    def cancel(self, error):
+
+        self.error = error
+
+        if self.key:
+            wraps.abort(self.key, error)
+
+
+def _call(token, func, args):
+
+    reset = wraps.token.set(token)
+
+    try:
+        return func(*args)
+    finally:
+        wraps.token.reset(reset)
+
+
+_parsers = {}
+
+
+def get(cls, args, options, limits, value):
+
+    """
+    Get ``value`` from a parser of ``cls`` created with ``args``, ``options``
+    and ``limits``, kept by this process unless limited.
+    """
+
+    if limits:
+        return cls(*args, **options, limits = limits).get(value)
+
+    key = (cls, args, *options.items())
+
+    try:
+        parser = _parsers[key]
+    except KeyError:
+        parser = _parsers[key] = cls(*args, **options)
+
+    return parser.get(value)
+
+
+class _Gate:
+
+    __slots__ = ('semaphore', 'waiting')
+
+    def __init__(self, concurrency):
+
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        self.waiting = 0
+
+
+class Pool:
+
+    """
+    Runs parses off the event loop.
+
+    :param concurrent.futures.Executor executor:
+        Where parses run, by default a thread pool of ``workers`` threads.
+        Process pools only serve :meth:`~.parsers.Base.aget`, with parsers of
+        the same class and options, but not profiled or diagnosed ones.
+    :param int concurrency:
+        The most parses submitted at once, defaulting to ``workers`` or the
+        executor's own default.
+    :param int backlog:
+        The most callers waiting for their turn; more raise
+        :class:`asyncio.QueueFull`. Unbounded by default.
+
+    Callers cancelled or timed out while their parse runs in a thread abort
+    it through the callbacks' return value. Parses in processes can only be
+    withdrawn before they start.
+
+    Concurrency and backlog are bounded per event loop, so a pool can serve
+    any number of them, one after the other or at once.
+    """
+
+    __slots__ = ('_executor', '_workers', '_concurrency', '_backlog', '_gates')
+
+    def __init__(self,
+                 executor = None,
+                 workers = None,
+                 concurrency = None,
+                 backlog = None):
+
+        self._executor = executor
+
+        self._workers = workers
+
+        if concurrency is None:
+            concurrency = workers or min(32, (os.cpu_count() or 1) + 4)
+
+        self._concurrency = concurrency
+
+        self._backlog = backlog
+
+        # semaphores only work within the loop they first wait in
+        self._gates = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self):
+
+        if not self._executor:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                self._workers,
+                thread_name_prefix = 'md4c'
+            )
+
+        return self._executor
+
+    @property
+    def processes(self):
+
+        return isinstance(self._executor, concurrent.futures.ProcessPoolExecutor)
+
+    def _gate(self, loop):
+
+        try:
+            return self._gates[loop]
+        except KeyError:
+            return self._gates.setdefault(loop, _Gate(self._concurrency))
+
+    async def _acquire(self, gate):
+
+        # only callers that would wait count against the backlog
+        if gate.semaphore.locked() and self._backlog is not None:
+            if gate.waiting >= self._backlog:
+                raise asyncio.QueueFull()
+
+        gate.waiting += 1
+
+        try:
+            await gate.semaphore.acquire()
+        finally:
+            gate.waiting -= 1
+
+    def _release(self, loop, gate):
+
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(gate.semaphore.release)
+
+    async def run(self, func, *args, timeout = None):
+
+        """
+        Get ``func(*args)`` from the executor, waiting at most ``timeout``
+        seconds for it.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        gate = self._gate(loop)
+
+        await self._acquire(gate)
+
+        token = None if self.processes else Token()
+
+        try:
+            if token:
+                future = self.executor.submit(_call, token, func, args)
+            else:
+                future = self.executor.submit(func, *args)
+        except BaseException:
+            gate.semaphore.release()
+            raise
+
+        # the slot is free once the work is, not when its caller gives up
+        future.add_done_callback(lambda future: self._release(loop, gate))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if token:
+                token.cancel(asyncio.CancelledError())
+            raise
+
+    def close(self):
+
+        if self._executor:
+            self._executor.shutdown(wait = False, cancel_futures = True)
+
+
+_pool = None
+
+
+def pool():
+
+    """
+    Get the pool used when none is given.
+    """
+
+    global _pool
+
+    if not _pool:
+        _pool = Pool()
+
+    return _pool
@@ -1,22 +1,114 @@
 import ctypes
+import threading
+import contextvars
 
 from . import enums
 from . import types
 from . import details
-from . import helpers
 
 
 __all__ = ()
 
 
-def _clause(enum, details, func):
+contexts = {}
+
+
+errors = {}
+
+
+# the tasks.Token of parses running for a coroutine
+token = contextvars.ContextVar('token', default = None)
+
+
+# keeps aborts from landing after their parse is released
+_lock = threading.Lock()
+
+
+def abort(key, error):
+
+    """
+    Make the running parse under ``key`` stop and raise ``error``.
+    """
+
+    with _lock:
+        if key in contexts:
+            errors.setdefault(key, error)
+
+
+def release(key):
+
+    """
+    Forget the parse under ``key``, getting its error, if any.
+    """
+
+    with _lock:
+        del contexts[key]
+        return errors.pop(key, None)
+
+
+def _mask(members, only):
+
+    return tuple(only is None or member in only for member in members)
+
+
+def _clause(enum, details, func,
+            only = None,
+            detail = True,
+            userdata = False,
+            unpack = False):
+
+    members = tuple(enum)
+
+    wanted = _mask(members, only)
+
+    classes = tuple(map(details.get, members) if detail else ())
+
+    classes += (None,) * (len(members) - len(classes))
+
+    if unpack:
+        def wrapper(type, detail_a, udata):
+            if udata in errors:
+                return 1
+            if not wanted[type]:
+                return 0
+            cls = classes[type]
+            detail = cls.from_address(detail_a) if cls and detail_a else None
+            try:
+                func(*contexts[udata], members[type], detail)
+            except BaseException as error:
+                errors.setdefault(udata, error)
+                return 1
+            return 0
+        return wrapper
+
+    if userdata:
+        def wrapper(type, detail_a, udata):
+            if udata in errors:
+                return 1
+            if not wanted[type]:
+                return 0
+            cls = classes[type]
+            detail = cls.from_address(detail_a) if cls and detail_a else None
+            try:
+                func(contexts.get(udata), members[type], detail)
+            except BaseException as error:
+                errors.setdefault(udata, error)
+                return 1
+            return 0
+        return wrapper
 
-    @helpers.enum_cb(enum)
     def wrapper(type, detail_a, udata):
-        type = enum(type)
-        cls = details.get(type)
+        if udata in errors:
+            return 1
+        if not wanted[type]:
+            return 0
+        cls = classes[type]
         detail = cls.from_address(detail_a) if cls and detail_a else None
-        func(type, detail)
+        try:
+            func(members[type], detail)
+        except BaseException as error:
+            errors.setdefault(udata, error)
+            return 1
         return 0
 
     return wrapper
@@ -28,13 +120,14 @@ _block_details = {
     enums.Block.li  : details.Li  ,
     enums.Block.h   : details.H   ,
     enums.Block.code: details.Code,
+    enums.Block.th  : details.Td  ,
     enums.Block.td  : details.Td
 }
 
 
-def block(func):
+def block(func, **options):
 
-    return _clause(enums.Block, _block_details, func)
+    return _clause(enums.Block, _block_details, func, **options)
 
 
 _span_details = {
@@ -44,26 +137,73 @@ _span_details = {
 }
 
 
-def span(func):
+def span(func, **options):
+
+    return _clause(enums.Span, _span_details, func, **options)
+
+
+def text(func, only = None, userdata = False, unpack = False):
+
+    members = tuple(enums.Text)
 
-    return _clause(enums.Span, _span_details, func)
+    wanted = _mask(members, only)
 
+    if unpack:
+        def wrapper(type, data, size, udata):
+            if udata in errors:
+                return 1
+            if not wanted[type]:
+                return 0
+            data = ctypes.string_at(data, size)
+            try:
+                func(*contexts[udata], members[type], data)
+            except BaseException as error:
+                errors.setdefault(udata, error)
+                return 1
+            return 0
+        return wrapper
 
-def text(func):
+    if userdata:
+        def wrapper(type, data, size, udata):
+            if udata in errors:
+                return 1
+            if not wanted[type]:
+                return 0
+            data = ctypes.string_at(data, size)
+            try:
+                func(contexts.get(udata), members[type], data)
+            except BaseException as error:
+                errors.setdefault(udata, error)
+                return 1
+            return 0
+        return wrapper
 
-    @helpers.enum_cb(enums.Text)
     def wrapper(type, data, size, udata):
-        data = data[:size]
-        func(type, data)
+        if udata in errors:
+            return 1
+        if not wanted[type]:
+            return 0
+        data = ctypes.string_at(data, size)
+        try:
+            func(members[type], data)
+        except BaseException as error:
+            errors.setdefault(udata, error)
+            return 1
         return 0
 
     return wrapper
 
 
-def debug_log(func):
+def debug_log(func, userdata = False):
 
     def wrapper(message, udata):
-        func(message)
+        try:
+            if userdata:
+                func(contexts.get(udata), message)
+            else:
+                func(message)
+        except BaseException as error:
+            errors.setdefault(udata, error)
         return 0
 
     return wrapper
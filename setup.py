@@ -1,5 +1,9 @@
+import os
+import platform
 import setuptools
 
+from setuptools.command.build_py import build_py
+
 with open('README.rst') as file:
 
     readme = file.read()
@@ -12,16 +16,75 @@ author = 'Exahilosys'
 
 url = f'https://github.com/{author}/{name}'
 
+# md4c's src directory, compiled into the package when present
+source = os.environ.get('MD4C_SOURCE', os.path.join('vendor', 'md4c', 'src'))
+
+suffixes = {'Darwin': '.dylib', 'Windows': '.dll'}
+
+
+class Build(build_py):
+
+    """
+    Compile ``md4c.c`` into ``bin/(system)-(machine)`` before copying files.
+    """
+
+    def run(self):
+
+        if os.path.isfile(os.path.join(source, 'md4c.c')):
+            self._compile()
+
+        super().run()
+
+    def _compile(self):
+
+        from distutils import ccompiler, sysconfig
+
+        compiler = ccompiler.new_compiler()
+
+        sysconfig.customize_compiler(compiler)
+
+        objects = compiler.compile(
+            [os.path.join(source, 'md4c.c')],
+            output_dir = self.get_finalized_command('build').build_temp,
+            include_dirs = [source],
+            macros = [('MD4C_USE_UTF8', None)],
+            extra_preargs = [] if compiler.compiler_type == 'msvc' else ['-fPIC', '-O2']
+        )
+
+        system = platform.system()
+
+        root = f'{system}-{platform.machine().lower()}'
+
+        path = os.path.join(name, 'bin', root + suffixes.get(system, '.so'))
+
+        compiler.link_shared_object(objects, path, export_symbols = ['md_parse'])
+
+
+class Distribution(setuptools.Distribution):
+
+    def has_ext_modules(self):
+
+        # a compiled library makes the wheel specific to this platform
+        return os.path.isfile(os.path.join(source, 'md4c.c'))
+
+
 setuptools.setup(
     name = name,
     version = version,
     author = author,
     url = url,
-    packages = setuptools.find_packages(),
+    packages = setuptools.find_packages(exclude = ('benchmarks',)),
     license = 'MIT',
     description = 'Markdown parsing.',
     long_description = readme,
     include_package_data = True,
+    package_data = {
+        name: ['bin/*']
+    },
+    cmdclass = {
+        'build_py': Build
+    },
+    distclass = Distribution,
     extras_require = {
         'html': [
             'bs4'
@@ -0,0 +1,20 @@
+import pytest
+
+from md4c import clients
+
+
+def pytest_configure(config):
+
+    # without a native library, events come from the benchmarks' stand-in
+    try:
+        clients.load()
+    except OSError:
+        from benchmarks import standin
+        standin.install()
+
+
+@pytest.fixture
+def native():
+
+    if clients.lib.__class__.__module__ == 'benchmarks.standin':
+        pytest.skip('needs the native library')
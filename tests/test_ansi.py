@@ -0,0 +1,99 @@
+import io
+import os
+import shutil
+
+import pytest
+
+from md4c import parsers
+
+
+sty = pytest.importorskip('sty')
+
+
+source = '# Title\n\nSome *text* here\n'
+
+
+def test_output():
+
+    assert parsers.Ansi().get(source) == (
+        f'# Title #\nSome {sty.ef.italic}text{sty.rs.italic} here'
+    )
+
+
+def test_styles(native):
+
+    value = '**bold** ~~gone~~ _under_\n'
+
+    assert parsers.Ansi().get(value) == (
+        f'{sty.ef.bold}bold{sty.rs.bold_dim} '
+        f'{sty.ef.strike}gone{sty.rs.strike} '
+        f'{sty.ef.underl}under{sty.rs.underl}'
+    )
+
+
+class _File:
+
+    def __init__(self, cls):
+
+        self.writes = []
+
+        self.value = cls()
+
+    def write(self, data):
+
+        self.writes.append(data)
+
+        return self.value.write(data)
+
+
+@pytest.mark.parametrize('value, cls', (
+    (source, io.StringIO),
+    (source.encode(), io.BytesIO)
+))
+def test_into(value, cls):
+
+    parser = parsers.Ansi()
+
+    into = _File(cls)
+
+    parser.get(value, into = into)
+
+    assert into.value.getvalue() == parser.get(value)
+
+    # nothing is written for tags closing without output
+    assert len(into.writes) > 1 and all(into.writes)
+
+
+def test_ordered():
+
+    assert parsers.Ansi().get('3. x\n4. y\n') == '3. x\n4. y'
+
+
+def test_nested(native):
+
+    value = '1. a\n2. b\n   - c\n   - d\n'
+
+    assert parsers.Ansi().get(value) == '1. a\n2. b\n  - c\n  - d'
+
+
+def test_rules_and_images(native, monkeypatch):
+
+    sizes = []
+
+    def size():
+        sizes.append(None)
+        return os.terminal_size((10, 5))
+
+    monkeypatch.setattr(shutil, 'get_terminal_size', size)
+
+    parser = parsers.Ansi()
+
+    assert parser.get('a\n\n---\n\nb\n\n***\n') == 'a----------b----------'
+
+    assert len(sizes) == 1
+
+    assert parser.get('![alt](/i.png) c\n') == '/i.png\nalt c'
+
+    assert parser.get('---\n') == '----------'
+
+    assert len(sizes) == 2
@@ -0,0 +1,155 @@
+import os
+import time
+
+import pytest
+
+from md4c import caches
+from md4c import parsers
+
+
+@pytest.fixture(params = ('memory', 'disk'))
+def make(request, tmp_path):
+
+    if request.param == 'memory':
+        return caches.Memory
+
+    return lambda *args, **kwargs: caches.Disk(str(tmp_path), *args, **kwargs)
+
+
+def test_get_set(make):
+
+    cache = make()
+
+    assert cache.get('key') is None
+
+    cache.set('key', 'value')
+
+    cache.set(('bytes',), b'value')
+
+    assert cache.get('key') == 'value'
+
+    assert cache.get(('bytes',)) == b'value'
+
+    assert cache.stats.as_dict() == {'hits': 2, 'misses': 1, 'evictions': 0}
+
+    assert cache.stats.ratio == 2 / 3
+
+
+def test_evicts_least_recently_used(make):
+
+    cache = make(size = 2)
+
+    cache.set('a', 'a')
+
+    cache.set('b', 'b')
+
+    cache.get('a')
+
+    cache.set('c', 'c')
+
+    assert cache.get('b') is None
+
+    assert cache.get('a') == 'a'
+
+    assert cache.get('c') == 'c'
+
+    assert cache.stats.evictions == 1
+
+
+def test_limits_total_length(make):
+
+    cache = make(limit = 10)
+
+    cache.set('big', 'x' * 11)
+
+    assert cache.get('big') is None
+
+    cache.set('a', 'x' * 6)
+
+    cache.set('b', 'x' * 6)
+
+    assert cache.get('a') is None
+
+    assert cache.get('b') == 'x' * 6
+
+
+def test_clear(make):
+
+    cache = make()
+
+    cache.set('a', 'a')
+
+    cache.clear()
+
+    assert cache.get('a') is None
+
+
+def test_disk_shared_across_instances(tmp_path):
+
+    caches.Disk(str(tmp_path)).set('a', 'value')
+
+    cache = caches.Disk(str(tmp_path))
+
+    assert cache.get('a') == 'value'
+
+
+def test_disk_counts_entries_of_others(tmp_path):
+
+    cache = caches.Disk(str(tmp_path), limit = 10)
+
+    caches.Disk(str(tmp_path)).set('a', 'x' * 6)
+
+    assert cache.get('a') == 'x' * 6
+
+    cache.set('b', 'x' * 6)
+
+    assert cache.get('a') is None
+
+    assert cache.get('b') == 'x' * 6
+
+
+def test_disk_failed_write_leaves_nothing(tmp_path, monkeypatch):
+
+    cache = caches.Disk(str(tmp_path))
+
+    def replace(source, target):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', replace)
+
+    with pytest.raises(OSError):
+        cache.set('a', 'value')
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_disk_removes_stale_partial_writes(tmp_path):
+
+    (stale, fresh) = (tmp_path / 'stale.part', tmp_path / 'fresh.part')
+
+    stale.write_bytes(b'')
+
+    fresh.write_bytes(b'')
+
+    old = time.time() - caches.Disk._stale - 1
+
+    os.utime(stale, (old, old))
+
+    caches.Disk(str(tmp_path))
+
+    assert os.listdir(tmp_path) == ['fresh.part']
+
+
+def test_parser_cache(make):
+
+    cache = make()
+
+    parser = parsers.Markup(cache = cache)
+
+    first = parser.get('*a*\n')
+
+    assert parser.get('*a*\n') == first
+
+    assert parser.get(b'*a*\n') == first.encode()
+
+    assert cache.stats.as_dict() == {'hits': 1, 'misses': 2, 'evictions': 0}
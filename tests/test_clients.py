@@ -0,0 +1,139 @@
+import io
+import os
+import threading
+
+import pytest
+
+from md4c import enums
+from md4c import clients
+from md4c import parsers
+
+
+source = '# Title\n\nSome *text* &amp; more – ünïcode\n'
+
+
+def _texts(parse, value):
+
+    texts = []
+
+    client = clients.Main(text = lambda type, data: texts.append(data))
+
+    getattr(client, parse)(value)
+
+    return b''.join(texts)
+
+
+expected = 'TitleSome text &amp; more – ünïcode'.encode()
+
+
+def test_parse_file(tmp_path):
+
+    path = tmp_path / 'source.md'
+
+    path.write_bytes(source.encode())
+
+    assert _texts('parse_file', str(path)) == expected
+
+    with open(path, 'rb') as file:
+        assert _texts('parse_file', file) == expected
+
+    assert _texts('parse_file', io.StringIO(source)) == expected
+
+    path.write_bytes(b'')
+
+    assert _texts('parse_file', path) == b''
+
+
+def test_parse_file_pipe():
+
+    (read, write) = os.pipe()
+
+    def feed():
+        with open(write, 'wb') as file:
+            file.write(source.encode())
+
+    thread = threading.Thread(target = feed)
+
+    thread.start()
+
+    with open(read, 'rb') as file:
+        assert _texts('parse_file', file) == expected
+
+    thread.join()
+
+
+def test_userdata():
+
+    calls = []
+
+    plain = clients.Main(text = lambda *args: calls.append(args))
+
+    plain.parse('text\n', 'ignored')
+
+    given = clients.Main(userdata = True, text = lambda *args: calls.append(args))
+
+    given.parse('text\n', 'given')
+
+    assert calls == [
+        (enums.Text.normal, b'text'),
+        ('given', enums.Text.normal, b'text')
+    ]
+
+
+def test_parse_stream():
+
+    chunks = [source[:5], source[5:12].encode(), source[12:]]
+
+    assert _texts('parse_stream', iter(chunks)) == expected
+
+
+def test_get_file_and_stream(tmp_path):
+
+    parser = parsers.Markup()
+
+    path = tmp_path / 'source.md'
+
+    path.write_bytes(source.encode())
+
+    assert parser.get_file(str(path)) == parser.get(source)
+
+    assert parser.get_stream(source.splitlines(True)) == parser.get(source)
+
+    into = io.StringIO()
+
+    parser.get_file(str(path), into = into)
+
+    assert into.getvalue() == parser.get(source)
+
+
+@pytest.mark.parametrize('kind', (bytes, bytearray, memoryview))
+def test_bytes_like(kind):
+
+    value = kind(source.encode())
+
+    assert _texts('parse', value) == expected
+
+    parser = parsers.Markup()
+
+    result = parser.get(value)
+
+    assert isinstance(result, bytes)
+
+    assert result == parser.get(source).encode()
+
+
+def test_encoding():
+
+    value = source.encode('latin-1', 'replace')
+
+    texts = []
+
+    client = clients.Main('latin-1', text = lambda type, data: texts.append(data))
+
+    client.parse(value.decode('latin-1'))
+
+    assert b''.join(texts) == expected.decode().encode('latin-1', 'replace')
+
+    parser = parsers.Markup('latin-1')
+
+    assert parser.get(value) == parser.get(value.decode('latin-1')).encode('latin-1')
@@ -0,0 +1,79 @@
+import ctypes
+
+import pytest
+
+from md4c import enums
+from md4c import types
+from md4c import clients
+from md4c import details
+
+
+def _link(source):
+
+    buffer = clients.Main().record(source)
+
+    (detail,) = (
+        buffer.get(offset, size, detail)
+        for (kind, type, offset, size, detail) in buffer
+        if kind == enums.Event.enter_span and type == enums.Span.a
+    )
+
+    return detail
+
+
+def test_decode_plain():
+
+    link = _link('[a](/url)\n')
+
+    assert details.decode(link.href, 'utf-8') == '/url'
+
+
+@pytest.mark.parametrize('source, href, title', (
+    ('[a](/u?a=1&amp;b=&#35;2)\n', '/u?a=1&b=#2', ''),
+    ('[a](/url "t &copy; x")\n', '/url', 't © x'),
+    ('[a](<>)\n', '', '')
+), ids = ('entities', 'size', 'empty'))
+def test_decode(native, source, href, title):
+
+    link = _link(source)
+
+    assert details.decode(link.href, 'utf-8') == href
+
+    assert details.decode(link.title, 'utf-8') == title
+
+
+def test_decode_attribute():
+
+    # entities are their own substrings, and nothing past size is read
+    data = b'/u?a=1&amp;b=&#35;2" title'
+
+    substrs = (enums.Text.normal, enums.Text.entity, enums.Text.normal,
+               enums.Text.entity, enums.Text.normal)
+
+    values = (
+        ctypes.create_string_buffer(data, len(data)),
+        (types.enum * len(substrs))(*substrs),
+        (types.offset * 6)(0, 6, 11, 13, 18, 19)
+    )
+
+    attribute = details.Attribute(
+        ctypes.cast(values[0], types.char_p),
+        19,
+        ctypes.cast(values[1], ctypes.POINTER(types.enum)),
+        ctypes.cast(values[2], ctypes.POINTER(types.offset))
+    )
+
+    assert details.decode(attribute, 'utf-8') == '/u?a=1&b=#2'
+
+    assert details.decode(attribute.detach(), 'utf-8') == '/u?a=1&b=#2'
+
+
+def test_decode_is_interned():
+
+    first = details.decode(_link('[a](/same)\n').href, 'utf-8')
+
+    second = details.decode(_link('[b](/same)\n').href, 'utf-8')
+
+    assert first == '/same'
+
+    assert first is second
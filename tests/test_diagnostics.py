@@ -0,0 +1,101 @@
+import pytest
+
+from md4c import wraps
+from md4c import clients
+from md4c import diagnostics
+
+
+def _client(channel, message = b'message'):
+
+    """
+    Get a client whose text callback makes the library's ``debug_log``
+    report ``message`` when reaching ``b'here'``.
+    """
+
+    def text(userdata, type, data):
+        if data != b'here':
+            return
+        # the key of this parse, as the library would pass it
+        (key,) = (key for (key, value) in wraps.contexts.items() if value is userdata)
+        client._traced.debug_log(message, key)
+
+    client = clients.Main(diagnostics = channel, userdata = True, text = text)
+
+    return client
+
+
+def test_accept():
+
+    assert diagnostics.Channel().accept()
+
+    assert not diagnostics.Channel(sample = 0).accept()
+
+
+def test_debug_log():
+
+    received = []
+
+    channel = diagnostics.Channel(handler = received.append)
+
+    _client(channel).parse('some *here*\n', object())
+
+    (diagnostic,) = channel.records
+
+    assert received == [diagnostic]
+
+    assert diagnostic.as_dict() == {
+        'kind'   : 'debug',
+        'message': 'message',
+        'offset' : None
+    }
+
+
+def test_offsets():
+
+    channel = diagnostics.Channel(offsets = True)
+
+    source = 'some *here* text\n'
+
+    _client(channel).parse(source, object())
+
+    (diagnostic,) = channel.records
+
+    assert diagnostic.offset == source.index('here') + len('here')
+
+
+def test_rate():
+
+    channel = diagnostics.Channel(rate = 2)
+
+    client = _client(channel)
+
+    for _ in range(5):
+        client.parse('*here*\n', object())
+
+    assert len(channel.records) == 2
+
+    assert channel.dropped + len(channel.records) <= 5
+
+    assert not channel.accept()
+
+
+def test_unsampled_parses_skip_the_channel():
+
+    channel = diagnostics.Channel(sample = 0)
+
+    client = clients.Main(diagnostics = channel)
+
+    client.parse('*here*\n')
+
+    assert not channel.records
+
+
+def test_handler_errors_abort_the_parse():
+
+    def handler(diagnostic):
+        raise ValueError(diagnostic.message)
+
+    channel = diagnostics.Channel(handler = handler)
+
+    with pytest.raises(ValueError, match = 'message'):
+        _client(channel).parse('*here*\n', object())
@@ -0,0 +1,112 @@
+import pytest
+
+from md4c import edits
+from md4c import parsers
+
+
+class Counter:
+
+    """
+    Counts the documents rendered by a parser.
+    """
+
+    def __init__(self, parser):
+
+        self.parser = parser
+
+        self.renders = 0
+
+    def get(self, value):
+
+        self.renders += 1
+
+        return self.parser.get(value)
+
+    def replay(self, buffer):
+
+        return self.parser.replay(buffer)
+
+
+document = (
+    '# Title\n'
+    '\n'
+    'Some *text* with [a link][one].\n'
+    '\n'
+    '- first\n'
+    '- second\n'
+    '\n'
+    '```\n'
+    'code\n'
+    '\n'
+    'more code\n'
+    '```\n'
+    '\n'
+    '[one]: /one\n'
+    '\n'
+    'Last [paragraph][two]\n'
+    '\n'
+    '[two]:\n'
+    '/two\n'
+    '"Title"\n'
+)
+
+
+@pytest.mark.parametrize('value', (
+    document,
+    document.rstrip('\n'),
+    'A paragraph\n\n[x][a]\n\n[a]: /a\n\nno trailing newline',
+    '[x][a]\n\n[a]:\n  /multi\n  "line title"\n\ntext',
+    '[x][a]\n\n[a]: /a\n\n```\nunclosed [a]: /b',
+    '[a]: /a\nnot a [definition]: /b\n\n[x][a] [y][definition]\n',
+    ''
+))
+def test_matches_full_render(value):
+
+    parser = parsers.Markup()
+
+    editor = edits.Editor(parser)
+
+    assert editor.get(value) == parser.get(value)
+
+
+def test_renders_changed_blocks_only():
+
+    parser = Counter(parsers.Markup())
+
+    editor = edits.Editor(parser)
+
+    editor.get(document)
+
+    renders = parser.renders
+
+    edited = document.replace('- second', '- changed')
+
+    assert editor.get(edited) == parser.parser.get(edited)
+
+    assert parser.renders - renders == 1
+
+
+def test_definitions_rerender_everything():
+
+    parser = Counter(parsers.Markup())
+
+    editor = edits.Editor(parser)
+
+    editor.get(document)
+
+    renders = parser.renders
+
+    edited = document.replace('[one]: /one', '[one]: /other')
+
+    assert editor.get(edited) == parser.parser.get(edited)
+
+    assert parser.renders - renders == len(edits._split(edited)[0])
+
+
+def test_split_whole_definitions():
+
+    (blocks, defines) = edits._split('[a]:\n/url\n"title"\n\ntext')
+
+    assert defines == '[a]:\n/url\n"title"\n'
+
+    assert blocks == ['[a]:\n/url\n"title"\n\n', 'text']
@@ -0,0 +1,159 @@
+import pickle
+
+import pytest
+
+from md4c import enums
+from md4c import wraps
+from md4c import events
+from md4c import details
+from md4c import clients
+from md4c import parsers
+
+
+source = '# Title\n\nSome *text* &amp; [a link](/url)\nand more\n'
+
+
+def test_record_buffer():
+
+    buffer = clients.Main().record(source)
+
+    assert isinstance(buffer, events.Buffer)
+
+    assert buffer.data == source.encode()
+
+    assert len(buffer.records) == len(buffer) * buffer.width
+
+    kinds = [kind for (kind, type, offset, size, detail) in buffer]
+
+    assert kinds[0] == enums.Event.enter_block
+
+    assert kinds[-1] == enums.Event.leave_block
+
+    assert kinds.count(enums.Event.enter_block) == kinds.count(enums.Event.leave_block)
+
+
+def test_record_text_points_into_source():
+
+    buffer = clients.Main().record(source.encode())
+
+    texts = [
+        bytes(buffer.get(offset, size, detail))
+        for (kind, type, offset, size, detail) in buffer
+        if kind == enums.Event.text
+    ]
+
+    assert texts[:2] == [b'Title', b'Some ']
+
+    assert b'&amp;' in texts
+
+    assert b'\n' in texts
+
+
+def test_record_keeps_details():
+
+    buffer = clients.Main().record(source)
+
+    (detail,) = (
+        buffer.get(offset, size, detail)
+        for (kind, type, offset, size, detail) in buffer
+        if kind == enums.Event.enter_span and type == enums.Span.a
+    )
+
+    assert detail.href.text == b'/url'
+
+
+def test_replay_matches_get():
+
+    parser = parsers.Markup()
+
+    buffer = parser.client.record(source)
+
+    assert parser.replay(buffer) == parser.get(source)
+
+
+def test_stream_columns():
+
+    stream = clients.Main().events(source)
+
+    assert isinstance(stream, events.Stream)
+
+    size = len(stream)
+
+    columns = (stream.kinds, stream.types, stream.offsets, stream.sizes,
+               stream.details)
+
+    assert all(len(column) == size for column in columns)
+
+    assert list(stream) == list(zip(*columns))
+
+
+def test_stream_count_and_where():
+
+    stream = clients.Main().events(source)
+
+    enter = enums.Event.enter_block
+
+    assert stream.count(enter) == list(stream.kinds).count(enter)
+
+    indexes = stream.where(enums.Event.enter_span, enums.Span.em)
+
+    assert len(indexes) == stream.count(enums.Event.enter_span, enums.Span.em) == 1
+
+    (index,) = indexes
+
+    assert bytes(stream.text(index + 1)) == b'text'
+
+
+def test_stream_text_is_zero_copy():
+
+    stream = clients.Main().events(source)
+
+    (index,) = stream.where(enums.Event.text, enums.Text.entity)
+
+    text = stream.text(index)
+
+    assert isinstance(text, memoryview)
+
+    assert text.obj is stream.data
+
+    assert bytes(text) == b'&amp;'
+
+
+def test_stream_pickles():
+
+    stream = clients.Main().events(source)
+
+    copy = pickle.loads(pickle.dumps(stream))
+
+    assert list(copy) == list(stream)
+
+    assert copy.data == stream.data
+
+
+def test_stream_replays():
+
+    parser = parsers.Markup()
+
+    stream = parser.client.events(source)
+
+    assert parser.replay(stream) == parser.get(source)
+
+
+def test_record_errors_are_raised(monkeypatch):
+
+    def detach(self):
+        raise ValueError('detach')
+
+    monkeypatch.setattr(details.A, 'detach', detach)
+
+    with pytest.raises(ValueError, match = 'detach'):
+        clients.Main().record(source)
+
+    with pytest.raises(ValueError, match = 'detach'):
+        parsers.Tree().get(source)
+
+    monkeypatch.undo()
+
+    assert not wraps.errors
+
+    assert len(clients.Main().record(source))
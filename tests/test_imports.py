@@ -0,0 +1,43 @@
+import sys
+import subprocess
+
+from benchmarks import imports
+
+
+def _run(code):
+
+    return subprocess.run([sys.executable, '-c', code], check = True)
+
+
+def test_lazy():
+
+    _run(
+        'import sys, md4c\n'
+        'md4c.Block.doc\n'
+        'md4c.Spec.tables\n'
+        'for name in ("md4c.clients", "md4c.parsers", "ctypes", "bs4", "sty"):\n'
+        '    assert name not in sys.modules, name\n'
+    )
+
+
+def test_budget():
+
+    # the best of a few interpreters, like python -m benchmarks.imports
+    results = [imports.measure() for _ in range(3)]
+
+    (best, loaded) = min(results)
+
+    assert loaded == []
+
+    assert best <= imports.budget
+
+
+def test_lazy_names():
+
+    import md4c
+
+    from md4c import parsers
+
+    assert md4c.Markup is parsers.Markup
+
+    assert 'Markup' in dir(md4c)
@@ -0,0 +1,75 @@
+import pytest
+
+from md4c import limits
+from md4c import clients
+from md4c import parsers
+
+
+nested = ''.join(f'{"  " * depth}- item\n' for depth in range(10))
+
+
+@pytest.mark.parametrize('name, value', (
+    ('events', 10),
+    ('depth', 5),
+    ('output', 20),
+    ('time', 0)
+))
+def test_exceeded(name, value):
+
+    parser = parsers.Markup(limits = limits.Limits(**{name: value}))
+
+    with pytest.raises(limits.Exceeded) as info:
+        parser.get(nested)
+
+    error = info.value
+
+    assert error.limit == name
+
+    assert set(error.stats) == {'events', 'depth', 'output', 'time'}
+
+    assert error.stats[name] > value or name == 'time'
+
+
+def test_within():
+
+    bounds = limits.Limits(time = 60, events = 1000, depth = 50, output = 1000)
+
+    parser = parsers.Markup(limits = bounds)
+
+    assert parser.get(nested) == parsers.Markup().get(nested)
+
+    small = limits.Limits(events = 1)
+
+    with pytest.raises(limits.Exceeded):
+        parsers.Markup(limits = small).get(nested)
+
+    # nothing is left behind by parses, finished or aborted
+    assert not bounds._guards and not small._guards
+
+
+def test_unbounded():
+
+    parser = parsers.Markup(limits = limits.Limits())
+
+    assert parser.get(nested) == parsers.Markup().get(nested)
+
+
+@pytest.mark.parametrize('name, value', (
+    ('events', 3),
+    ('depth', 2)
+))
+def test_record(name, value):
+
+    bounds = limits.Limits(**{name: value})
+
+    with pytest.raises(limits.Exceeded) as info:
+        clients.Main(limits = bounds).record(nested)
+
+    assert info.value.limit == name
+
+    with pytest.raises(limits.Exceeded):
+        parsers.Tree(limits = bounds).get(nested)
+
+    assert not bounds._guards
+
+    assert len(clients.Main(limits = limits.Limits(events = 1000)).record(nested))
@@ -0,0 +1,97 @@
+import os
+import platform
+import ctypes.util
+
+import pytest
+
+from md4c import binds
+from md4c import clients
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+
+    monkeypatch.delenv(clients._variable, raising = False)
+
+    monkeypatch.setattr(clients, '__file__', str(tmp_path / 'clients.py'))
+
+    monkeypatch.setattr(platform, 'system', lambda: 'Linux')
+
+    monkeypatch.setattr(platform, 'machine', lambda: 'X86_64')
+
+    monkeypatch.setattr(ctypes.util, 'find_library', lambda name: None)
+
+    path = tmp_path / 'bin'
+
+    path.mkdir()
+
+    return path
+
+
+def test_find_variable(directory, monkeypatch):
+
+    (directory / 'Linux-x86_64.so').write_bytes(b'')
+
+    monkeypatch.setenv(clients._variable, '/custom/libmd4c.so')
+
+    assert clients._find() == '/custom/libmd4c.so'
+
+
+def test_find_machine_first(directory):
+
+    for name in ('Linux.so', 'Linux-x86_64.so', 'Linux-arm64.so'):
+        (directory / name).write_bytes(b'')
+
+    assert clients._find() == os.path.join(directory, 'Linux-x86_64.so')
+
+    os.remove(directory / 'Linux-x86_64.so')
+
+    assert clients._find() == os.path.join(directory, 'Linux.so')
+
+
+def test_find_library(directory, monkeypatch):
+
+    (directory / 'Darwin.dylib').write_bytes(b'')
+
+    monkeypatch.setattr(ctypes.util, 'find_library', lambda name: 'libmd4c.so.0')
+
+    assert clients._find() == 'libmd4c.so.0'
+
+
+def test_find_nothing(directory):
+
+    with pytest.raises(FileNotFoundError, match = 'Linux'):
+        clients._find()
+
+
+def _library(accepted):
+
+    def md_parse(text, size, store, udata):
+        if store.api_version == accepted:
+            return 0
+        store.debug_log(b'Unsupported abi_version', None)
+        return -1
+
+    return {'md_parse': md_parse}
+
+
+def test_check():
+
+    binds.check(_library(0), 0)
+
+    with pytest.raises(OSError, match = 'api_version 1 .* Unsupported abi_version'):
+        binds.check(_library(0), 1)
+
+
+def test_load_rejects(monkeypatch):
+
+    monkeypatch.setattr(clients, 'lib', None)
+
+    monkeypatch.setattr(clients.Main, '_version', 1)
+
+    monkeypatch.setattr(binds, 'load', lambda path: _library(0))
+
+    with pytest.raises(OSError, match = 'rejects api_version 1'):
+        clients.load('libmd4c.so')
+
+    assert clients.lib is None
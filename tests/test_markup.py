@@ -0,0 +1,188 @@
+import html.parser
+
+import pytest
+
+from md4c import parsers
+
+
+# (name, source, markup, full, same as Html), where full cases are beyond the
+# benchmarks' stand-in and differing ones are documented by Markup
+corpus = (
+    (
+        'heading',
+        '# Title\n',
+        '<body><h1>Title</h1></body>',
+        False,
+        True
+    ),
+    (
+        'emphasis',
+        'Some *text* here\n',
+        '<body><p>Some <em>text</em> here</p></body>',
+        False,
+        True
+    ),
+    (
+        'paragraphs',
+        'one\ntwo\n\nthree\n',
+        '<body><p>one\ntwo</p><p>three</p></body>',
+        False,
+        True
+    ),
+    (
+        'escapes',
+        'a < b & c > d\n',
+        '<body><p>a &lt; b &amp; c &gt; d</p></body>',
+        False,
+        True
+    ),
+    (
+        'link',
+        '[a link](/x?a=1&b=2)\n',
+        '<body><p><a href="/x?a=1&amp;b=2">a link</a></p></body>',
+        False,
+        True
+    ),
+    (
+        'lists',
+        '- one\n  - two\n- three\n',
+        '<body><ul><li>one<ul><li>two</li></ul></li><li>three</li></ul></body>',
+        False,
+        True
+    ),
+    (
+        'code',
+        '```py\nx = a < b\n```\n',
+        '<body><pre><code class="language-py">x = a &lt; b\n</code></pre></body>',
+        False,
+        True
+    ),
+    (
+        'table',
+        '| a | b | c |\n|:--|--:|---|\n| 1 | 2 | 3 |\n',
+        '<body><table><thead><tr><th align="left">a</th><th align="right">b</th>'
+        '<th>c</th></tr></thead><tbody><tr><td align="left">1</td>'
+        '<td align="right">2</td><td>3</td></tr></tbody></table></body>',
+        False,
+        True
+    ),
+    (
+        'entities',
+        'Fish &amp; chips &copy;\n',
+        '<body><p>Fish &amp; chips &copy;</p></body>',
+        False,
+        False
+    ),
+    (
+        'quote',
+        '> **quoted**\n\n---\n',
+        '<body><blockquote><p><strong>quoted</strong></p></blockquote><hr/></body>',
+        True,
+        True
+    ),
+    (
+        'ordered',
+        '1. one\n2. two\n',
+        '<body><ol start="1"><li>one</li><li>two</li></ol></body>',
+        True,
+        True
+    ),
+    (
+        'strike',
+        'a ~~b~~ _c_\n',
+        '<body><p>a <del>b</del> <u>c</u></p></body>',
+        True,
+        True
+    ),
+    (
+        'br',
+        'line  \nbreak\n',
+        '<body><p>line<br/>\nbreak</p></body>',
+        True,
+        False
+    ),
+    (
+        'titles',
+        '[a](/url "Title") ![alt *x*](/i.png)\n',
+        '<body><p><a href="/url" title="Title">a</a> '
+        '<img alt="alt x" src="/i.png"/></p></body>',
+        True,
+        False
+    ),
+    (
+        'raw',
+        'some <b>raw</b> html\n',
+        '<body><p>some <b>raw</b> html</p></body>',
+        True,
+        False
+    )
+)
+
+
+class _Tokens(html.parser.HTMLParser):
+
+    def __init__(self):
+
+        super().__init__()
+
+        self.tokens = []
+
+    def handle_starttag(self, tag, attrs):
+
+        self.tokens.append(('start', tag, tuple(sorted(attrs))))
+
+    def handle_endtag(self, tag):
+
+        self.tokens.append(('end', tag))
+
+    def handle_data(self, data):
+
+        if self.tokens and self.tokens[-1][0] == 'data':
+            data = self.tokens.pop()[1] + data
+
+        self.tokens.append(('data', data))
+
+
+def normalize(value):
+
+    """
+    Get the tags, sorted attributes and unescaped text of ``value``.
+    """
+
+    tokens = _Tokens()
+
+    tokens.feed(value)
+
+    tokens.close()
+
+    return tokens.tokens
+
+
+cases = pytest.mark.parametrize(
+    'source, markup, full, same',
+    [case[1:] for case in corpus],
+    ids = [case[0] for case in corpus]
+)
+
+
+@cases
+def test_markup(request, source, markup, full, same):
+
+    if full:
+        request.getfixturevalue('native')
+
+    assert normalize(parsers.Markup().get(source)) == normalize(markup)
+
+
+@cases
+def test_markup_matches_html(request, source, markup, full, same):
+
+    pytest.importorskip('bs4')
+
+    if full:
+        request.getfixturevalue('native')
+
+    if not same:
+        pytest.skip('documented difference')
+
+    assert normalize(parsers.Markup().get(source)) == normalize(parsers.Html().get(source))
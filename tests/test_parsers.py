@@ -0,0 +1,95 @@
+import concurrent.futures
+
+from md4c import enums
+from md4c import parsers
+
+
+values = [
+    f'# Document {index}\n\n' + f'- item *{index}* [link](/{index})\n' * 20
+    for index in range(8)
+]
+
+
+def test_threads():
+
+    parser = parsers.Markup()
+
+    expected = {value: parser.get(value) for value in values}
+
+    def check(value):
+        return all(parser.get(value) == expected[value] for _ in range(5))
+
+    with concurrent.futures.ThreadPoolExecutor(8) as pool:
+        assert all(pool.map(check, values * 4))
+
+
+class Nested(parsers.Markup):
+
+    """
+    Renders the text of emphasis as a document of its own, from within.
+    """
+
+    __slots__ = ()
+
+    def _track(self, state, type, data):
+
+        if state.closes and state.closes[-1] == '</em>':
+            data = self.get(data.decode()).encode()
+            type = enums.Text.html
+
+        super()._track(state, type, data)
+
+
+def test_reentrant():
+
+    value = 'a *b* c\n'
+
+    assert Nested().get(value) == '<body><p>a <em><body><p>b</p></body></em> c</p></body>'
+
+
+
+class Emphasis(parsers.Base):
+
+    """
+    Collects the text of emphasis, handling no other tags.
+    """
+
+    __slots__ = ()
+
+    class _State:
+
+        __slots__ = ('parts', 'opened')
+
+        def __init__(self):
+
+            self.parts = []
+
+            self.opened = []
+
+    def _parse_em(self, state, info):
+
+        state.opened.append('em')
+
+    def _leave(self, state, type, info):
+
+        state.opened.pop()
+
+    def _track(self, state, type, data):
+
+        if state.opened:
+            state.parts.append(data.decode())
+
+    def _get(self, state):
+
+        return state.parts
+
+
+def test_replay_skips_unhandled():
+
+    value = '# Title\n\n- a *b* c\n- *d*\n'
+
+    parser = Emphasis()
+
+    buffer = parsers.Markup().client.record(value)
+
+    assert parser.replay(buffer) == parser.get(value) == ['b', 'd']
@@ -0,0 +1,38 @@
+from md4c import parsers
+
+
+values = [f'# {index}\n\n*text* {index}\n' for index in range(40)]
+
+
+def test_map_ordered():
+
+    parser = parsers.Markup()
+
+    results = list(parsers.Markup.map(values, workers = 2, chunksize = 8))
+
+    assert results == [parser.get(value) for value in values]
+
+
+def test_map_unordered():
+
+    parser = parsers.Markup()
+
+    results = dict(parsers.Markup.map(values, workers = 2, ordered = False))
+
+    assert results == {index: parser.get(value) for (index, value) in enumerate(values)}
+
+
+def test_map_options():
+
+    results = list(parsers.Tables.map(['| a |\n|---|\n| 1 |\n'], format = 'json'))
+
+    assert results == ['{"a": "1"}\n']
+
+
+def test_map_capture():
+
+    results = list(parsers.Markup.map(['*a*\n', 1], workers = 1, capture = True))
+
+    assert results[0] == parsers.Markup().get('*a*\n')
+
+    assert isinstance(results[1], Exception)
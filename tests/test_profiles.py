@@ -0,0 +1,79 @@
+import json
+
+from md4c import enums
+from md4c import clients
+from md4c import parsers
+
+
+source = '# Title\n\nSome *text*\n'
+
+
+def test_stats_counts():
+
+    client = clients.Main(profile = True)
+
+    assert client.profile
+
+    client.parse(source)
+
+    counts = client.stats.counts
+
+    assert counts[enums.Block][enums.Block.h] == 2
+
+    assert counts[enums.Span][enums.Span.em] == 2
+
+
+def test_stats_fresh_per_parse():
+
+    client = clients.Main(profile = True)
+
+    client.parse(source)
+
+    first = client.stats
+
+    client.parse(source)
+
+    assert client.stats is not first
+
+    assert client.stats.counts == first.counts
+
+
+def test_stats_as_dict():
+
+    parser = parsers.Markup(profile = True)
+
+    parser.get(source)
+
+    stats = parser.client.stats
+
+    values = json.loads(stats.as_json())
+
+    assert values['counts']['block.h'] == 2
+
+    assert values['total'] >= values['native']
+
+    assert stats.handlers
+
+
+def test_no_stats():
+
+    client = clients.Main()
+
+    client.parse(source)
+
+    assert not client.profile
+
+    assert not client.stats
+
+
+def test_record_stats():
+
+    parser = parsers.Tree(profile = True)
+
+    parser.get(source)
+
+    stats = parser.client.stats
+
+    assert stats.counts[enums.Block][enums.Block.h] == 2
+
+    assert stats.total >= stats.callbacks > 0
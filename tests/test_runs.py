@@ -0,0 +1,81 @@
+from md4c import enums
+from md4c import caches
+from md4c import clients
+from md4c import parsers
+
+
+def _texts(value, **options):
+
+    texts = []
+
+    client = clients.Main(
+        text = lambda type, data: texts.append((type, data)),
+        **options
+    )
+
+    client.parse(value)
+
+    return texts
+
+
+def test_merges_runs():
+
+    value = 'Fish &amp; chips\nand *more* &copy;\n'
+
+    assert _texts(value, coalesce = True) == [
+        (enums.Text.normal, 'Fish & chips\nand '.encode()),
+        (enums.Text.normal, b'more'),
+        (enums.Text.normal, ' ©'.encode())
+    ]
+
+
+def test_keeps_other_text():
+
+    value = '```\ncode &amp;\n```\n'
+
+    assert _texts(value, coalesce = True) == _texts(value)
+
+
+def test_parsers():
+
+    value = 'Fish &amp; chips &copy;\n'
+
+    assert parsers.Markup(coalesce = True).get(value) == (
+        '<body><p>Fish &amp; chips ©</p></body>'
+    )
+
+
+def test_cache_keys_options():
+
+    cache = caches.Memory()
+
+    value = 'Fish &amp; chips &copy;\n'
+
+    plain = parsers.Markup(cache = cache)
+
+    merged = parsers.Markup(cache = cache, coalesce = True)
+
+    results = [parser.get(value) for parser in (plain, merged, plain, merged)]
+
+    assert results == [plain.get(value), merged.get(value)] * 2
+
+    assert results[0] != results[1]
+
+    assert cache.stats.misses == 2
+
+
+def test_record():
+
+    value = 'Fish &amp; chips\nand *more*\n'
+
+    (paragraph,) = parsers.Tree(coalesce = True).get(value).children
+
+    assert [(node.type, node.value) for node in paragraph.children[:1]] == [
+        (enums.Text.normal, 'Fish & chips\nand ')
+    ]
+
+    buffer = clients.Main(coalesce = True).record(value)
+
+    kinds = [kind for (kind, type, offset, size, detail) in buffer]
+
+    assert kinds.count(enums.Event.text) == 2
@@ -0,0 +1,131 @@
+import io
+import json
+import asyncio
+import concurrent.futures
+
+import pytest
+
+from md4c import tasks
+from md4c import caches
+from md4c import parsers
+
+
+source = (
+    '# Prices\n'
+    '\n'
+    '| name | price |\n'
+    '|:-----|------:|\n'
+    '| fish &amp; chips | 5 |\n'
+    '| tea, hot | 1 |\n'
+    '\n'
+    'Between tables.\n'
+    '\n'
+    '| a | b |\n'
+    '|---|---|\n'
+    '| *x* | [y](/y) |\n'
+)
+
+
+def test_csv():
+
+    assert parsers.Tables().get(source) == (
+        'name,price\n'
+        'fish & chips,5\n'
+        '"tea, hot",1\n'
+        '\n'
+        'a,b\n'
+        'x,y\n'
+    )
+
+
+def test_json():
+
+    lines = parsers.Tables(format = 'json').get(source).splitlines()
+
+    assert list(map(json.loads, lines)) == [
+        {'name': 'fish & chips', 'price': '5'},
+        {'name': 'tea, hot', 'price': '1'},
+        {'a': 'x', 'b': 'y'}
+    ]
+
+
+def test_extract():
+
+    assert parsers.Tables().extract(source) == [
+        [['name', 'price'], ['fish & chips', '5'], ['tea, hot', '1']],
+        [['a', 'b'], ['x', 'y']]
+    ]
+
+
+def test_unknown_format():
+
+    with pytest.raises(ValueError):
+        parsers.Tables(format = 'xml')
+
+
+@pytest.mark.parametrize('format', ('csv', 'json'))
+def test_into(format):
+
+    parser = parsers.Tables(format = format)
+
+    into = io.StringIO()
+
+    assert parser.get(source, into = into) is None
+
+    assert into.getvalue() == parser.get(source)
+
+
+@pytest.mark.parametrize('format', ('csv', 'json'))
+def test_bytes(format):
+
+    parser = parsers.Tables(format = format)
+
+    result = parser.get(source.encode())
+
+    assert result == parser.get(source).encode()
+
+    into = io.BytesIO()
+
+    parser.get(source.encode(), into = into)
+
+    assert into.getvalue() == result
+
+
+def test_markup_bytes_into():
+
+    parser = parsers.Markup()
+
+    into = io.BytesIO()
+
+    parser.get(source.encode(), into = into)
+
+    assert into.getvalue() == parser.get(source).encode()
+
+
+def test_cache_keys_format():
+
+    cache = caches.Memory()
+
+    rows = parsers.Tables(cache = cache)
+
+    records = parsers.Tables(format = 'json', cache = cache)
+
+    assert rows.get(source) == parsers.Tables().get(source)
+
+    assert records.get(source) == parsers.Tables(format = 'json').get(source)
+
+    assert cache.stats.misses == 2
+
+
+def test_aget_in_processes():
+
+    pool = tasks.Pool(concurrent.futures.ProcessPoolExecutor(1))
+
+    parser = parsers.Tables(format = 'json')
+
+    try:
+        result = asyncio.run(parser.aget(source, pool = pool))
+    finally:
+        pool.close()
+
+    assert result == parser.get(source)
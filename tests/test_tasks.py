@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import concurrent.futures
+
+import pytest
+
+from md4c import wraps
+from md4c import tasks
+from md4c import caches
+from md4c import clients
+from md4c import parsers
+
+
+source = 'Fish &amp; chips &copy;\n\n' + '- item *text*\n' * 20
+
+
+def test_aget():
+
+    parser = parsers.Markup()
+
+    result = asyncio.run(parser.aget(source))
+
+    assert result == parser.get(source)
+
+
+def test_default_pool_across_loops():
+
+    parser = parsers.Markup()
+
+    async def main():
+        return await asyncio.gather(*(parser.aget(source) for _ in range(50)))
+
+    for _ in range(2):
+        assert asyncio.run(main()) == [parser.get(source)] * 50
+
+
+def test_backlog():
+
+    pool = tasks.Pool(workers = 1, backlog = 0)
+
+    parser = parsers.Markup()
+
+    async def main():
+        return await asyncio.gather(
+            *(parser.aget(source, pool = pool) for _ in range(3)),
+            return_exceptions = True
+        )
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        pool.close()
+
+    assert results[0] == parser.get(source)
+
+    assert all(isinstance(result, asyncio.QueueFull) for result in results[1:])
+
+
+def _blocking():
+
+    """
+    Get a client whose first text waits for ``release``, and its calls.
+    """
+
+    (started, release, calls) = (threading.Event(), threading.Event(), [])
+
+    def text(type, data):
+        calls.append(data)
+        started.set()
+        release.wait(5)
+
+    client = clients.Main(text = text)
+
+    return (client, started, release, calls)
+
+
+@pytest.mark.parametrize('cancel', ('timeout', 'cancel'))
+def test_aparse_aborts(cancel):
+
+    (client, started, release, calls) = _blocking()
+
+    executor = concurrent.futures.ThreadPoolExecutor(1)
+
+    pool = tasks.Pool(executor)
+
+    async def main():
+        task = asyncio.ensure_future(client.aparse(source, pool = pool, timeout = 0.1))
+        if cancel == 'cancel':
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+        return await task
+
+    with pytest.raises((asyncio.TimeoutError, asyncio.CancelledError)):
+        asyncio.run(main())
+
+    release.set()
+
+    executor.shutdown(wait = True)
+
+    # the parse stopped at the next event
+    assert len(calls) == 1
+
+    assert not wraps.errors and not wraps.contexts
+
+
+def test_cancelled_token_aborts_records():
+
+    token = tasks.Token()
+
+    token.cancel(ValueError('cancelled'))
+
+    reset = wraps.token.set(token)
+
+    try:
+        with pytest.raises(ValueError, match = 'cancelled'):
+            parsers.Tree().get(source)
+        with pytest.raises(ValueError, match = 'cancelled'):
+            parsers.Markup().get(source)
+    finally:
+        wraps.token.reset(reset)
+
+    assert not wraps.errors
+
+
+def test_abort_after_release():
+
+    wraps.contexts[0] = None
+
+    wraps.release(0)
+
+    wraps.abort(0, ValueError())
+
+    assert not wraps.errors
+
+
+def test_aparse_in_processes():
+
+    pool = tasks.Pool(concurrent.futures.ProcessPoolExecutor(1))
+
+    try:
+        with pytest.raises(TypeError):
+            asyncio.run(clients.Main().aparse(source, pool = pool))
+    finally:
+        pool.close()
+
+
+def test_aget_in_processes():
+
+    pool = tasks.Pool(concurrent.futures.ProcessPoolExecutor(1))
+
+    cache = caches.Memory()
+
+    parser = parsers.Markup(coalesce = True, cache = cache)
+
+    async def main():
+        return [await parser.aget(source, pool = pool) for _ in range(2)]
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        pool.close()
+
+    assert results == [parser.get(source)] * 2
+
+    assert '©' in results[0]
+
+    assert cache.stats.hits == 2
@@ -0,0 +1,108 @@
+import sys
+import concurrent.futures
+
+from md4c import enums
+from md4c import nodes
+from md4c import parsers
+
+
+source = '# Title\n\nSome *text* and [a link](/url)\n'
+
+
+def test_get():
+
+    root = parsers.Tree().get(source)
+
+    assert isinstance(root, nodes.Node)
+
+    assert root.type is enums.Block.doc
+
+    (heading, paragraph) = root.children
+
+    assert heading.type is enums.Block.h
+
+    assert heading.detail.level == 1
+
+    assert heading.text == 'Title'
+
+    assert paragraph.text == 'Some text and a link'
+
+    link = paragraph.children[-1]
+
+    assert link.type is enums.Span.a
+
+    assert link.detail.href.text == b'/url'
+
+
+def test_offsets():
+
+    root = parsers.Tree().get(source)
+
+    for node in root.walk():
+        if isinstance(node, nodes.Text):
+            assert source[node.offset:node.offset + len(node.value)] == node.value
+
+    (heading, paragraph) = root.children
+
+    assert (heading.start, heading.end) == (2, 7)
+
+    assert source[paragraph.start:paragraph.end] == 'Some *text* and [a link'
+
+    assert (root.start, root.end) == (heading.start, paragraph.end)
+
+
+def test_replay_without_offsets():
+
+    parser = parsers.Tree()
+
+    buffer = parser.client.record(source)
+
+    root = parser.replay(buffer)
+
+    assert root.text == parser.get(source).text
+
+    stream = parser.client.events(source)
+
+    assert parser.replay(stream).text == root.text
+
+
+def test_walk_depth_first():
+
+    root = parsers.Tree().get(source)
+
+    types = [node.type for node in root.walk()]
+
+    assert types[:4] == [enums.Block.doc, enums.Block.h, enums.Text.normal, enums.Block.p]
+
+
+def _shape(node):
+
+    return [(node.type, getattr(node, 'value', None)) for node in node.walk()]
+
+
+def test_threads():
+
+    interval = sys.getswitchinterval()
+
+    # switch threads often, so parses interleave
+    sys.setswitchinterval(1e-6)
+
+    parser = parsers.Tree()
+
+    values = [
+        f'# Document {index}\n\n' + f'- item *{index}* [link](/{index})\n' * 40
+        for index in range(8)
+    ]
+
+    expected = {value: _shape(parser.get(value)) for value in values}
+
+    def check(value):
+        return all(_shape(parser.get(value)) == expected[value] for _ in range(5))
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(check, values * 4))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert all(results)